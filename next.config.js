@@ -5,6 +5,16 @@
 import "./src/env.js";
 
 /** @type {import("next").NextConfig} */
-const config = {};
+const config = {
+  async rewrites() {
+    // Reports link charts relative to the page, the core API serves them
+    return [
+      {
+        source: "/api/v1/charts/:path*",
+        destination: `${process.env.CORE_API_URL}/charts/:path*`,
+      },
+    ];
+  },
+};
 
 export default config;
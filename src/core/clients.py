@@ -0,0 +1,130 @@
+import httpx
+from agents import Model, OpenAIChatCompletionsModel, set_default_openai_client
+from langchain_openai import ChatOpenAI
+from openai import AsyncOpenAI
+
+from .config import Config, Settings
+from .egress import PublicAddressTransport
+from .ratelimit import RateLimitedTransport
+
+
+class ClientRegistry:
+    """Pooled HTTP clients shared by every model call in the process.
+
+    Each endpoint gets one connection pool, so TLS connections are kept alive
+    and reused across the many agent calls a single request makes, and one
+    rate limiter that paces calls against the provider's per-model limits.
+    """
+
+    def __init__(self, settings: Settings):
+        self.settings = settings
+        # Opened by start() and dropped by close(), so every lifespan gets live pools
+        self.openai_http: httpx.AsyncClient | None = None
+        self.openai: AsyncOpenAI | None = None
+        self.external: AsyncOpenAI | None = None
+        self.web: httpx.AsyncClient | None = None
+        self._chat_models: dict[str, ChatOpenAI] = {}
+
+    def _http_client(self) -> httpx.AsyncClient:
+        transport = httpx.AsyncHTTPTransport(
+            limits=httpx.Limits(
+                max_connections=self.settings.HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=self.settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=self.settings.HTTP_KEEPALIVE_EXPIRY,
+            )
+        )
+        return httpx.AsyncClient(
+            transport=RateLimitedTransport(transport, self.settings),
+            timeout=httpx.Timeout(
+                self.settings.HTTP_TIMEOUT,
+                connect=self.settings.HTTP_CONNECT_TIMEOUT,
+            ),
+        )
+
+    def chat_model(self, model: str) -> ChatOpenAI:
+        """A LangChain chat model for `model` that uses the shared OpenAI pool"""
+        if model not in self._chat_models:
+            self._chat_models[model] = ChatOpenAI(
+                model=model,
+                api_key=self.settings.OPENAI_API_KEY,
+                http_async_client=self.openai_http,
+                max_retries=0,
+            )
+        return self._chat_models[model]
+
+    def external_model(self, model: str) -> "ExternalChatModel":
+        """An Agents SDK model for `model` on the external endpoint.
+
+        The model looks the client up on every call rather than binding it, so
+        agents can be built at import time, before start() opens the pools.
+        """
+        return ExternalChatModel(self, model)
+
+    async def start(self) -> None:
+        settings = self.settings
+        self.openai_http = self._http_client()
+        # RateLimitedTransport retries 429s and transient failures; SDK retries
+        # on top of it would multiply the attempts and ignore the shared backoff
+        self.openai = AsyncOpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            http_client=self.openai_http,
+            max_retries=0,
+        )
+        self.external = AsyncOpenAI(
+            base_url=settings.EXTERNAL_API_BASE_URL,
+            api_key=settings.EXTERNAL_API_KEY,
+            http_client=self._http_client(),
+            max_retries=0,
+        )
+        # Plain web page fetches get their own pool, separate from model calls,
+        # and only ever reach public addresses
+        transport = httpx.AsyncHTTPTransport(
+            limits=httpx.Limits(max_connections=settings.FETCH_MAX_CONNECTIONS)
+        )
+        self.web = httpx.AsyncClient(
+            transport=PublicAddressTransport(transport),
+            timeout=httpx.Timeout(settings.FETCH_TIMEOUT_SECONDS),
+            headers={"User-Agent": settings.FETCH_USER_AGENT},
+            follow_redirects=True,
+        )
+        # Chat models built against a previous lifespan's pool would use a closed client
+        self._chat_models.clear()
+        # Agents without an explicit model client use the pooled OpenAI client
+        set_default_openai_client(self.openai)
+
+    async def close(self) -> None:
+        if self.openai is not None:
+            await self.openai.close()
+        if self.external is not None:
+            await self.external.close()
+        if self.web is not None:
+            await self.web.aclose()
+        self.openai_http = self.openai = self.external = self.web = None
+        self._chat_models.clear()
+
+
+class ExternalChatModel(Model):
+    """Chat completions on the registry's external client, resolved per call"""
+
+    def __init__(self, registry: ClientRegistry, model: str):
+        self.registry = registry
+        self.model = model
+        self._bound: tuple[AsyncOpenAI, OpenAIChatCompletionsModel] | None = None
+
+    def _resolve(self) -> OpenAIChatCompletionsModel:
+        client = self.registry.external
+        if client is None:
+            raise RuntimeError("clients.start() has not been called")
+        if self._bound is None or self._bound[0] is not client:
+            model = OpenAIChatCompletionsModel(model=self.model, openai_client=client)
+            self._bound = (client, model)
+        return self._bound[1]
+
+    async def get_response(self, *args, **kwargs):
+        return await self._resolve().get_response(*args, **kwargs)
+
+    def stream_response(self, *args, **kwargs):
+        return self._resolve().stream_response(*args, **kwargs)
+
+
+clients = ClientRegistry(Config)
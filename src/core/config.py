@@ -6,6 +6,136 @@ class Settings(BaseSettings):
     EXTERNAL_API_KEY: str
     EXTERNAL_API_BASE_URL: str
 
+    # Root log level, per-logger overrides (e.g. {"chart_tool": "DEBUG"}) and
+    # output format, either "json" or "text"
+    LOG_LEVEL: str = "INFO"
+    LOG_LEVELS: dict[str, str] = {}
+    LOG_FORMAT: str = "json"
+
+    # Connection pool used for each model endpoint
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY: float = 60
+    HTTP_CONNECT_TIMEOUT: float = 10
+    HTTP_TIMEOUT: float = 600
+
+    # Per-model provider limits in requests and tokens per minute, e.g.
+    # {"gpt-4o": 500}; models without an entry are only paced by 429 responses.
+    # Calls are charged their estimated prompt plus their completion cap, or
+    # RATE_LIMIT_COMPLETION_TOKENS when they don't set one. Inline images are
+    # charged RATE_LIMIT_IMAGE_TOKENS each instead of their encoded size.
+    MODEL_RPM_LIMITS: dict[str, int] = {}
+    MODEL_TPM_LIMITS: dict[str, int] = {}
+    RATE_LIMIT_COMPLETION_TOKENS: int = 1000
+    RATE_LIMIT_IMAGE_TOKENS: int = 1000
+    # 429s pause every call to the model for the provider's retry-after, or an
+    # exponential backoff from RATE_LIMIT_BACKOFF_SECONDS, before retrying.
+    # Timeouts, connection errors, 408, 409 and 5xx retry the same way but only
+    # delay the failed call.
+    RATE_LIMIT_MAX_RETRIES: int = 3
+    RATE_LIMIT_BACKOFF_SECONDS: float = 1
+
+    # Maximum concurrent agent calls per model, shared by every request
+    AGENT_CONCURRENCY_LIMITS: dict[str, int] = {"gpt-4o": 16, "o3-mini": 4}
+    AGENT_DEFAULT_CONCURRENCY: int = 8
+    # Model used by agents that don't set one explicitly
+    AGENT_DEFAULT_MODEL: str = "gpt-4o"
+
+    # Deadline for a single search, including a hedged duplicate if one is
+    # started once the search is slower than the observed percentile
+    SEARCH_TIMEOUT_SECONDS: float = 90
+    SEARCH_HEDGE_PERCENTILE: float = 0.9
+    SEARCH_HEDGE_MIN_SAMPLES: int = 20
+    # Writing starts once this fraction of searches succeeded or the stage
+    # deadline passes; remaining searches are cancelled and reported as dropped
+    SEARCH_QUORUM: float = 1.0
+    SEARCH_STAGE_TIMEOUT_SECONDS: float = 180
+
+    # Writer input is deduplicated with MinHash and trimmed to this many tokens;
+    # sources at or above the similarity thresholds are treated as repeats
+    WRITER_INPUT_TOKEN_BUDGET: int = 8000
+    COMPACTION_SOURCE_THRESHOLD: float = 0.95
+    COMPACTION_SENTENCE_THRESHOLD: float = 0.7
+
+    # Finished reports are reused for queries with the same content words as an
+    # earlier one, as long as their hashed word vectors, which also count
+    # generic words like "latest" or "overview", have at least this similarity
+    REPORT_CACHE_THRESHOLD: float = 0.85
+    REPORT_CACHE_TTL_SECONDS: float = 6 * 60 * 60
+    REPORT_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+
+    # Completed research is kept in this SQLite database, compressed with
+    # "zstd" when the zstandard package is installed or "gzip" otherwise
+    RESULT_STORE_PATH: str = ".data/results.sqlite3"
+    RESULT_STORE_CODEC: str = "zstd"
+    # Follow-up searches with the same content words as one the earlier research
+    # already answered, and at least this similar, reuse its summary instead
+    FOLLOW_UP_SEARCH_THRESHOLD: float = 0.8
+
+    # Batch requests accept up to BATCH_MAX_QUERIES queries, of which at most
+    # BATCH_CONCURRENCY run at a time while as many again are planned ahead
+    BATCH_MAX_QUERIES: int = 200
+    BATCH_CONCURRENCY: int = 8
+
+    # Research requests are rejected with 429 once ADMISSION_MAX_IN_FLIGHT are
+    # running or an agent call has queued for ADMISSION_MAX_QUEUE_WAIT_SECONDS.
+    # Past ADMISSION_DEGRADE_AT of either limit, plans shrink linearly from
+    # ADMISSION_MAX_SEARCHES to ADMISSION_MIN_SEARCHES searches.
+    ADMISSION_MAX_IN_FLIGHT: int = 64
+    ADMISSION_MAX_QUEUE_WAIT_SECONDS: float = 30
+    ADMISSION_DEGRADE_AT: float = 0.5
+    ADMISSION_MAX_SEARCHES: int = 20
+    ADMISSION_MIN_SEARCHES: int = 5
+    ADMISSION_RETRY_AFTER_SECONDS: int = 5
+
+    # Search summaries are shared across requests for this long
+    SEARCH_CACHE_TTL_SECONDS: float = 900
+    SEARCH_CACHE_MAX_BYTES: int = 16 * 1024 * 1024
+
+    # Worker threads that build charts off the event loop, and as many worker
+    # processes that render them
+    CHART_WORKERS: int = 4
+    # "local" renders charts into CHART_STORE_DIR, "quickchart" links to quickchart.io
+    CHART_RENDERER: str = "local"
+    CHART_FORMAT: str = "png"
+    # Rendered charts are kept up to CHART_STORE_MAX_BYTES, least recently used
+    # ones are deleted past it
+    CHART_STORE_DIR: str = ".charts"
+    CHART_STORE_MAX_BYTES: int = 256 * 1024 * 1024
+    # URL the chart route is served from, used for links in reports. Relative
+    # links resolve against whichever host serves the report; set an absolute
+    # URL when reports are read elsewhere
+    CHART_BASE_URL: str = "/api/v1/charts"
+
+    # Background research jobs: worker count, queue bound, events kept per job
+    # for resuming streams, and how long finished jobs stay available
+    JOB_WORKERS: int = 4
+    JOB_MAX_PENDING: int = 100
+    JOB_MAX_EVENTS: int = 1000
+    JOB_RETENTION_SECONDS: float = 3600
+
+    # Show one aggregated live view of all active research jobs in the terminal
+    PROGRESS_DASHBOARD: bool = False
+    PROGRESS_DASHBOARD_REFRESH_PER_SECOND: float = 2
+
+    # Planned URLs are first read over plain HTTP; pages are cut off after
+    # FETCH_MAX_BYTES or FETCH_MAX_CHARS of text, and pages with less text
+    # than FETCH_MIN_TEXT_CHARS are handed to the browser agent
+    FETCH_TIMEOUT_SECONDS: float = 10
+    FETCH_MAX_BYTES: int = 2 * 1024 * 1024
+    FETCH_MAX_CHARS: int = 20000
+    FETCH_MIN_TEXT_CHARS: int = 500
+    FETCH_PER_HOST_LIMIT: int = 2
+    FETCH_MAX_CONNECTIONS: int = 50
+    FETCH_USER_AGENT: str = (
+        "Mozilla/5.0 (compatible; DeepResearchBot/1.0; +https://github.com/Yat3s/open-manus)"
+    )
+
+    # Warm browsers kept by the browser pool, recycled after BROWSER_MAX_USES tasks
+    BROWSER_POOL_SIZE: int = 2
+    BROWSER_MAX_USES: int = 20
+    BROWSER_HEADLESS: bool = True
+
     model_config = SettingsConfigDict(
         env_file=".env",
         extra="ignore",
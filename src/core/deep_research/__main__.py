@@ -0,0 +1,34 @@
+import asyncio
+
+from rich.console import Console
+from rich.markdown import Markdown
+
+from ..clients import clients
+from ..log import setup_logging, shutdown_logging
+from .manager import DeepResearchManager
+from .printer import Printer
+from .tools.browser_pool import browser_pool
+
+
+async def main() -> None:
+    query = input("What would you like to research? ")
+    console = Console()
+    setup_logging()
+    await clients.start()
+    try:
+        manager = DeepResearchManager(progress_factory=lambda _: Printer(console))
+        result = await manager.run(query)
+    finally:
+        await browser_pool.close()
+        await clients.close()
+        shutdown_logging()
+
+    console.rule("[bold blue]Report")
+    console.print(Markdown(result["report"]))
+    console.rule("[bold blue]Follow up questions")
+    for question in result["follow_up_questions"]:
+        console.print(f"• {question}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+from typing import Any
+
+from ..config import Config
+from ..metrics import metrics
+from .scheduler import AgentScheduler, agent_scheduler
+
+logger = logging.getLogger("deep_research_admission")
+
+admission_rejections = metrics.counter(
+    "deep_research_admission_rejections",
+    "Research requests rejected with 429 because the server was over capacity",
+)
+
+
+class Overloaded(Exception):
+    """Raised when a request can't be admitted; retry after `retry_after` seconds"""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class Admission:
+    """Capacity held by an admitted request until it is released"""
+
+    def __init__(self, controller: AdmissionController, weight: int):
+        self.controller = controller
+        self.weight = weight
+        self.released = False
+
+    def release(self) -> None:
+        if not self.released:
+            self.released = True
+            self.controller.in_flight -= self.weight
+
+
+class AdmissionController:
+    """Load-aware admission for research requests.
+
+    Load is measured as pressure: the larger of the share of
+    `max_in_flight` requests running and the longest current agent queue
+    wait as a share of `max_queue_wait`. Requests are rejected once pressure
+    reaches 1, and above `degrade_at` new plans are capped at fewer searches
+    so that admitted requests still finish in time.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int,
+        max_queue_wait: float,
+        degrade_at: float,
+        max_searches: int,
+        min_searches: int,
+        retry_after: int,
+        scheduler: AgentScheduler | None = None,
+        poll_seconds: float = 1.0,
+    ):
+        self.max_in_flight = max_in_flight
+        self.max_queue_wait = max_queue_wait
+        self.degrade_at = degrade_at
+        self.max_searches = max_searches
+        self.min_searches = min_searches
+        self.retry_after = retry_after
+        self.scheduler = scheduler or agent_scheduler
+        self.poll_seconds = poll_seconds
+        self.in_flight = 0
+        self.admitted = 0
+        self.rejected = 0
+
+    def pressure(self) -> float:
+        return max(
+            self.in_flight / self.max_in_flight,
+            self.scheduler.oldest_wait_seconds() / self.max_queue_wait,
+        )
+
+    def admit(self, weight: int = 1) -> Admission:
+        """Hold `weight` request slots, or raise Overloaded when over capacity"""
+        weight = min(weight, self.max_in_flight)
+        if not self._has_room(weight):
+            queue_wait = self.scheduler.oldest_wait_seconds()
+            self.rejected += 1
+            admission_rejections.inc()
+            logger.warning(
+                "Rejecting research request: %d in flight, agent queue wait %.1fs",
+                self.in_flight,
+                queue_wait,
+            )
+            # Calls queued now will have waited about this long once they run
+            retry_after = max(self.retry_after, math.ceil(queue_wait))
+            raise Overloaded("Server is over capacity, retry later", retry_after)
+
+        return self._hold(weight)
+
+    async def wait_admit(self, weight: int = 1) -> Admission:
+        """Hold `weight` request slots once there is capacity for them.
+
+        For work that was already accepted, like queued jobs, which waits its
+        turn instead of being rejected.
+        """
+        weight = min(weight, self.max_in_flight)
+        while not self._has_room(weight):
+            await asyncio.sleep(self.poll_seconds)
+        return self._hold(weight)
+
+    def _has_room(self, weight: int) -> bool:
+        return (
+            self.in_flight + weight <= self.max_in_flight
+            and self.scheduler.oldest_wait_seconds() < self.max_queue_wait
+        )
+
+    def _hold(self, weight: int) -> Admission:
+        self.in_flight += weight
+        self.admitted += 1
+        return Admission(self, weight)
+
+    def plan_limit(self) -> int:
+        """Searches a new plan may have at the current load"""
+        pressure = self.pressure()
+        if pressure <= self.degrade_at:
+            return self.max_searches
+        share = min((pressure - self.degrade_at) / (1 - self.degrade_at), 1.0)
+        return round(
+            self.max_searches - (self.max_searches - self.min_searches) * share
+        )
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "in_flight": self.in_flight,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "pressure": self.pressure(),
+            "plan_limit": self.plan_limit(),
+        }
+
+
+admission_controller = AdmissionController(
+    max_in_flight=Config.ADMISSION_MAX_IN_FLIGHT,
+    max_queue_wait=Config.ADMISSION_MAX_QUEUE_WAIT_SECONDS,
+    degrade_at=Config.ADMISSION_DEGRADE_AT,
+    max_searches=Config.ADMISSION_MAX_SEARCHES,
+    min_searches=Config.ADMISSION_MIN_SEARCHES,
+    retry_after=Config.ADMISSION_RETRY_AFTER_SECONDS,
+)
+
+metrics.add_collector(
+    "deep_research_load_pressure",
+    "Admission pressure, where 1 means new research requests are rejected",
+    lambda: [("", {}, admission_controller.pressure())],
+)
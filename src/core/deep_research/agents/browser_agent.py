@@ -1,12 +1,16 @@
+import asyncio
+
 from pydantic import BaseModel, Field
-from langchain_openai import ChatOpenAI
 
 from agents import (
     Agent,
     RunContextWrapper,
     function_tool,
 )
-from browser_use import Agent as BrowserAgent, Browser
+from browser_use import Agent as BrowserAgent
+
+from ...clients import clients
+from ..tools.browser_pool import browser_pool
 
 INSTRUCTIONS = """
     You are a browser agent. Your goal is to fetch detailed information based on the user's query.
@@ -31,13 +35,20 @@ class BrowserSearchContext(BaseModel):
 async def browser_search(
     context: RunContextWrapper[BrowserSearchContext], query: str
 ) -> str:
-    llm = ChatOpenAI(model="gpt-4o")
-    agent = BrowserAgent(
-        task=f"Find detailed information about {query} and return structured data.",
-        llm=llm,
-        browser=Browser(),
-    )
-    history = await agent.run()
+    llm = clients.chat_model("gpt-4o")
+    async with browser_pool.context() as (browser, browser_context):
+        agent = BrowserAgent(
+            task=f"Find detailed information about {query} and return structured data.",
+            llm=llm,
+            browser=browser,
+            browser_context=browser_context,
+        )
+        try:
+            history = await agent.run()
+        except asyncio.CancelledError:
+            # Stop the browser agent's step loop before its context is closed
+            agent.stop()
+            raise
 
     ## update the context with the extracted content
     context.context.searchResults = history.extracted_content()
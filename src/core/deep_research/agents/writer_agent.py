@@ -1,15 +1,9 @@
 # Agent used to synthesize a final report from the individual summaries.
 from pydantic import BaseModel
-from openai import AsyncOpenAI
-from ...config import Config
-from agents import Agent, OpenAIChatCompletionsModel
+from ...clients import clients
+from agents import Agent
 from ..tools.chart_tool import ChartRequest
 
-external_client = AsyncOpenAI(
-    base_url=Config.EXTERNAL_API_BASE_URL,
-    api_key=Config.EXTERNAL_API_KEY,
-)
-
 PROMPT = (
     "You are a senior researcher tasked with writing a cohesive report for a research query. "
     "You will be provided with the original query, and some initial research done by a research "
@@ -54,6 +48,6 @@ class ReportData(BaseModel):
 writer_agent = Agent(
     name="WriterAgent",
     instructions=PROMPT,
-    model=OpenAIChatCompletionsModel(model=MODEL_NAME, openai_client=external_client),
+    model=clients.external_model(MODEL_NAME),
     output_type=ReportData,
 )
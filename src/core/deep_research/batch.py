@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, AsyncGenerator, Awaitable, Callable, Dict
+
+from .agents.planner_agent import WebSearchItem, WebSearchPlan
+from .manager import DeepResearchManager
+from .metrics import batch_searches_shared
+from .utils import normalize_query
+
+logger = logging.getLogger("deep_research_batch")
+
+
+class ResearchBatch:
+    """Researches many related queries together, sharing their searches.
+
+    At most `concurrency` queries run their pipeline at a time, and as many
+    again are planned ahead so their plans are ready once a slot frees up.
+    Every flight is private to the batch. Searches are
+    deduplicated across the whole batch by normalized query: the first query
+    to need one runs it and every other query gets the same summary.
+    """
+
+    def __init__(
+        self,
+        queries: list[str],
+        concurrency: int,
+        manager_factory: Callable[..., DeepResearchManager] = DeepResearchManager,
+    ):
+        self.queries = queries
+        self.concurrency = concurrency
+        self.manager_factory = manager_factory
+        self.searches_requested = 0
+        self.searches_shared = 0
+        self._slots = asyncio.Semaphore(concurrency)
+        # Queries that are running or planned ahead, waiting for a slot
+        self._ahead = asyncio.Semaphore(2 * concurrency)
+        self._plans: dict[str, asyncio.Task[WebSearchPlan]] = {}
+        self._searches: dict[str, asyncio.Task[str | None]] = {}
+
+    def _planner(
+        self, query: str, manager: DeepResearchManager
+    ) -> asyncio.Task[WebSearchPlan]:
+        key = normalize_query(query)
+        if key not in self._plans:
+            self._plans[key] = asyncio.create_task(manager._plan_searches(query))
+        return self._plans[key]
+
+    async def plan(self, query: str, manager: DeepResearchManager) -> WebSearchPlan:
+        """The query's plan, from its planner if it was planned ahead"""
+        return await self._planner(query, manager)
+
+    async def search(
+        self,
+        item: WebSearchItem,
+        search: Callable[[WebSearchItem], Awaitable[str | None]],
+    ) -> str | None:
+        """Run a search once per batch, sharing its summary with every query"""
+        key = normalize_query(item.query)
+        self.searches_requested += 1
+        task = self._searches.get(key)
+        if task is None:
+            task = self._searches[key] = asyncio.create_task(search(item))
+        else:
+            self.searches_shared += 1
+            batch_searches_shared.inc()
+        # One query dropping the search must not cancel it for the others
+        return await asyncio.shield(task)
+
+    async def run(self) -> AsyncGenerator[Dict[str, Any], None]:
+        """Yield each query's outcome as soon as it finishes"""
+        tasks = [
+            asyncio.create_task(self._research(index, query))
+            for index, query in enumerate(self.queries)
+        ]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                yield await finished
+        finally:
+            leftovers = [
+                *tasks,
+                *self._plans.values(),
+                *self._searches.values(),
+            ]
+            for task in leftovers:
+                task.cancel()
+            await asyncio.gather(*leftovers, return_exceptions=True)
+            logger.info(
+                "Batch of %d queries ran %d searches for %d requested",
+                len(self.queries),
+                len(self._searches),
+                self.searches_requested,
+            )
+
+    async def _research(self, index: int, query: str) -> Dict[str, Any]:
+        manager = self.manager_factory(batch=self)
+        outcome: Dict[str, Any] = {"index": index, "query": query}
+        try:
+            result = await manager._cached(query)
+            if result is None:
+                async with self._ahead:
+                    # Plan ahead so the plan is ready once a slot frees up
+                    self._planner(query, manager)
+                    async with self._slots:
+                        result = await manager._run_flight(query)
+            outcome["result"] = result
+            outcome["status"] = "completed"
+        except Exception as e:
+            logger.error("Batch query %d failed: %s", index, e, exc_info=True)
+            outcome["status"] = "failed"
+            outcome["error"] = str(e)
+        return outcome
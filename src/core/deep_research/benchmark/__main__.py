@@ -0,0 +1,345 @@
+"""Offline benchmark of the research pipeline with stub agents.
+
+Every agent call is served by `StubRunner`, so the numbers reflect the
+pipeline's own overhead and concurrency behaviour rather than model latency:
+
+    python -m core.deep_research.benchmark --concurrency 16 --requests 64
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import resource
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+import httpx
+import uvicorn
+from agents import set_tracing_disabled
+from rich.console import Console
+from rich.table import Table
+
+from ...main import app
+from ...config import Config
+from ...log import setup_logging, shutdown_logging
+from ..cache import search_cache
+from ..manager import DeepResearchManager
+from ..pipeline import add_stage_observer, remove_stage_observer
+from ..report_cache import report_cache
+from ..scheduler import agent_scheduler
+from ..store import result_store
+from ..tools.chart_store import chart_store, start_render_workers
+from ..tools.fetch import page_fetcher
+from .stubs import Latency, StubProfile, StubRunner, StubWeb
+
+MODES = ("run", "stream", "http", "http_stream")
+
+
+def percentiles(values: list[float]) -> dict[str, float]:
+    if not values:
+        return {}
+    ordered = sorted(values)
+
+    def at(q: float) -> float:
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+    return {
+        "p50": at(0.5),
+        "p90": at(0.9),
+        "p99": at(0.99),
+        "max": ordered[-1],
+    }
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+class LoopLagMonitor:
+    """Samples how late the event loop wakes up a task sleeping for `interval`"""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.samples: list[float] = []
+        self._task: asyncio.Task | None = None
+
+    async def _sample(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(loop.time() - expected, 0.0))
+
+    def start(self) -> None:
+        self.samples = []
+        self._task = asyncio.create_task(self._sample())
+
+    async def stop(self) -> None:
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+
+
+class StageTimings:
+    def __init__(self):
+        self.durations: dict[str, list[float]] = defaultdict(list)
+        self.failures: dict[str, int] = defaultdict(int)
+
+    def __call__(self, stage: str, duration: float, failed: bool) -> None:
+        if failed:
+            self.failures[stage] += 1
+        else:
+            self.durations[stage].append(duration)
+
+
+class RequestDriver:
+    """Issues a single research request in one of the benchmark modes.
+
+    Returns the time to the first streamed event, or None for modes that
+    only return a complete result.
+    """
+
+    def __init__(self, client: httpx.AsyncClient):
+        self.client = client
+
+    async def run(self, query: str) -> float | None:
+        await DeepResearchManager().run(query)
+        return None
+
+    async def stream(self, query: str) -> float | None:
+        started = time.perf_counter()
+        first_event = None
+        async for _ in DeepResearchManager().run_stream(query):
+            if first_event is None:
+                first_event = time.perf_counter() - started
+        return first_event
+
+    async def http(self, query: str) -> float | None:
+        response = await self.client.post(
+            "/api/v1/deep_research", json={"query": query}
+        )
+        response.raise_for_status()
+        return None
+
+    async def http_stream(self, query: str) -> float | None:
+        started = time.perf_counter()
+        first_event = None
+        async with self.client.stream(
+            "POST", "/api/v1/deep_research_stream", json={"query": query}
+        ) as response:
+            response.raise_for_status()
+            async for _ in response.aiter_bytes():
+                if first_event is None:
+                    first_event = time.perf_counter() - started
+        return first_event
+
+
+async def run_mode(
+    request: Callable[[str], Awaitable[float | None]],
+    mode: str,
+    requests: int,
+    concurrency: int,
+    query_pool: int,
+) -> dict[str, Any]:
+    timings = StageTimings()
+    monitor = LoopLagMonitor()
+    latencies: list[float] = []
+    first_events: list[float] = []
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int) -> None:
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                first_event = await request(f"{mode} benchmark query {i % query_pool}")
+            except Exception as e:
+                errors += 1
+                logging.getLogger("benchmark").warning("Request failed: %r", e)
+                return
+            latencies.append(time.perf_counter() - started)
+            if first_event is not None:
+                first_events.append(first_event)
+
+    add_stage_observer(timings)
+    monitor.start()
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(one(i) for i in range(requests)))
+    finally:
+        elapsed = time.perf_counter() - started
+        await monitor.stop()
+        remove_stage_observer(timings)
+
+    return {
+        "mode": mode,
+        "requests": requests,
+        "concurrency": concurrency,
+        "errors": errors,
+        "elapsed_seconds": elapsed,
+        "throughput_rps": len(latencies) / elapsed if elapsed else 0.0,
+        "latency": percentiles(latencies),
+        "first_event": percentiles(first_events),
+        "stages": {
+            stage: percentiles(durations)
+            for stage, durations in timings.durations.items()
+        },
+        "stage_failures": dict(timings.failures),
+        "loop_lag": percentiles(monitor.samples),
+        "peak_rss_mb": peak_rss_mb(),
+        "scheduler": agent_scheduler.stats(),
+    }
+
+
+def print_report(console: Console, report: dict[str, Any]) -> None:
+    table = Table(
+        title=(
+            f"{report['mode']}: {report['requests']} requests at concurrency "
+            f"{report['concurrency']}, {report['throughput_rps']:.2f} req/s, "
+            f"{report['errors']} errors, peak RSS {report['peak_rss_mb']:.0f} MB"
+        )
+    )
+    table.add_column("Measure")
+    for column in ("p50", "p90", "p99", "max"):
+        table.add_column(f"{column} (ms)", justify="right")
+
+    rows = [("request", report["latency"]), ("first event", report["first_event"])]
+    rows += [(f"stage {name}", values) for name, values in report["stages"].items()]
+    rows.append(("event loop lag", report["loop_lag"]))
+    for name, values in rows:
+        if values:
+            table.add_row(
+                name, *(f"{values[q] * 1000:.1f}" for q in ("p50", "p90", "p99", "max"))
+            )
+    console.print(table)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m core.deep_research.benchmark",
+        description=__doc__.split("\n")[0],
+    )
+    parser.add_argument("--modes", default=",".join(MODES))
+    parser.add_argument("--requests", type=int, default=32)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument(
+        "--query-pool",
+        type=int,
+        default=0,
+        help="Number of distinct queries; repeats exercise single-flight and caching",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--planner-latency", type=float, default=0.5)
+    parser.add_argument("--search-latency", type=float, default=1.0)
+    parser.add_argument("--browser-latency", type=float, default=2.0)
+    parser.add_argument("--writer-latency", type=float, default=3.0)
+    parser.add_argument("--fetch-latency", type=float, default=0.2)
+    parser.add_argument("--latency-sigma", type=float, default=0.3)
+    parser.add_argument("--searches", type=int, default=8)
+    parser.add_argument("--summary-words", type=int, default=250)
+    parser.add_argument("--report-words", type=int, default=1500)
+    parser.add_argument("--charts", type=int, default=2)
+    parser.add_argument(
+        "--js-pages",
+        type=float,
+        default=0.1,
+        help="Fraction of planned pages that need the browser agent",
+    )
+    parser.add_argument("--log-level", default="WARNING")
+    parser.add_argument("--json", help="Also write the results to this file")
+    return parser.parse_args()
+
+
+async def main() -> None:
+    args = parse_args()
+    modes = [mode.strip() for mode in args.modes.split(",") if mode.strip()]
+    unknown = set(modes) - set(MODES)
+    if unknown:
+        raise SystemExit(f"Unknown modes: {', '.join(sorted(unknown))}")
+
+    setup_logging()
+    logging.getLogger().setLevel(args.log_level)
+    set_tracing_disabled(True)
+
+    def latency(median: float) -> Latency:
+        return Latency(median, args.latency_sigma)
+
+    profile = StubProfile(
+        planner=latency(args.planner_latency),
+        search=latency(args.search_latency),
+        browser=latency(args.browser_latency),
+        writer=latency(args.writer_latency),
+        fetch=latency(args.fetch_latency),
+        searches=args.searches,
+        summary_words=args.summary_words,
+        report_words=args.report_words,
+        charts=args.charts,
+        js_pages=args.js_pages,
+    )
+    agent_scheduler.runner = StubRunner(profile, seed=args.seed)
+    page_fetcher.http_client = StubWeb(profile, seed=args.seed).client()
+    # Results and charts from earlier benchmark runs must not be reused
+    store_dir = tempfile.TemporaryDirectory()
+    result_store.path = f"{store_dir.name}/results.sqlite3"
+    chart_store.directory = Path(store_dir.name) / "charts"
+    if Config.CHART_RENDERER == "local":
+        # Chart workers import the application on start, which mustn't be timed
+        await asyncio.gather(*map(asyncio.wrap_future, start_render_workers()))
+
+    # A real server on a loopback port, since the ASGI test transport buffers
+    # streamed responses; it shares this loop so the stubs apply to it too.
+    server = uvicorn.Server(
+        uvicorn.Config(
+            app, host="127.0.0.1", port=0, lifespan="off", log_level="warning"
+        )
+    )
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+    port = server.servers[0].sockets[0].getsockname()[1]
+
+    console = Console()
+    reports = []
+    try:
+        async with httpx.AsyncClient(
+            base_url=f"http://127.0.0.1:{port}",
+            timeout=None,
+            limits=httpx.Limits(max_connections=args.concurrency),
+        ) as client:
+            driver = RequestDriver(client)
+            for mode in modes:
+                # Each mode starts cold rather than reusing the previous one's work
+                search_cache.clear()
+                report_cache.clear()
+                report = await run_mode(
+                    getattr(driver, mode),
+                    mode,
+                    args.requests,
+                    args.concurrency,
+                    args.query_pool or args.requests,
+                )
+                print_report(console, report)
+                reports.append(report)
+    finally:
+        server.should_exit = True
+        await serving
+        await result_store.close()
+        store_dir.cleanup()
+        shutdown_logging()
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(reports, f, indent=2)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
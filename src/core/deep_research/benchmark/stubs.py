@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import random
+import zlib
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import Any, AsyncIterator
+
+import httpx
+from agents import Agent
+from openai.types.responses import ResponseTextDeltaEvent
+
+from ..agents.browser_agent import browser_agent
+from ..agents.planner_agent import WebSearchItem, WebSearchPlan, planner_agent
+from ..agents.search_agent import search_agent
+from ..agents.writer_agent import ReportData, writer_agent
+from ..tools.chart_tool import ChartRequest
+
+WORDS = (
+    "market growth capacity policy demand supply cost efficiency adoption "
+    "investment region forecast storage grid battery solar wind hydrogen "
+    "emissions regulation price trend share revenue customer network"
+).split()
+
+
+@dataclass
+class Latency:
+    """A log-normal latency distribution given by its median and spread"""
+
+    median: float
+    sigma: float = 0.3
+
+    def sample(self, rng: random.Random) -> float:
+        if self.median <= 0:
+            return 0.0
+        return rng.lognormvariate(math.log(self.median), self.sigma)
+
+
+@dataclass
+class StubProfile:
+    planner: Latency
+    search: Latency
+    browser: Latency
+    writer: Latency
+    searches: int = 8
+    summary_words: int = 250
+    browser_words: int = 400
+    report_words: int = 1500
+    charts: int = 2
+    stream_chunk_chars: int = 24
+    fetch: Latency = field(default_factory=lambda: Latency(0.2))
+    page_words: int = 800
+    js_pages: float = 0.1
+    """Fraction of planned pages that only render with JavaScript"""
+
+
+def _words(rng: random.Random, count: int) -> str:
+    sentences = []
+    while count > 0:
+        length = min(rng.randint(8, 20), count)
+        words = rng.choices(WORDS, k=length)
+        sentences.append(" ".join(words).capitalize() + ".")
+        count -= length
+    return " ".join(sentences)
+
+
+class StubResult:
+    """Stands in for RunResult"""
+
+    def __init__(self, final_output: Any):
+        self.final_output = final_output
+
+    def final_output_as(self, cls: type, raise_if_incorrect_type: bool = False) -> Any:
+        return self.final_output
+
+
+class StubStreamedResult:
+    """Stands in for RunResultStreaming, streaming the output's JSON as text deltas"""
+
+    def __init__(self, output: ReportData, latency: float, chunk_chars: int):
+        self._output = output
+        self._latency = latency
+        self._chunk_chars = chunk_chars
+        self.is_complete = False
+
+    async def stream_events(self) -> AsyncIterator[Any]:
+        text = self._output.model_dump_json()
+        chunks = [
+            text[i : i + self._chunk_chars]
+            for i in range(0, len(text), self._chunk_chars)
+        ]
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        delay = self._latency / max(len(chunks), 1)
+        for k, chunk in enumerate(chunks, start=1):
+            # Pace against a deadline so per-sleep overhead doesn't add up and
+            # the stream takes its configured latency, however many chunks
+            await asyncio.sleep(max(started + k * delay - loop.time(), 0))
+            yield SimpleNamespace(
+                type="raw_response_event",
+                data=ResponseTextDeltaEvent.model_construct(
+                    type="response.output_text.delta", delta=chunk
+                ),
+            )
+        self.is_complete = True
+
+    def cancel(self) -> None:
+        self.is_complete = True
+
+    def final_output_as(self, cls: type, raise_if_incorrect_type: bool = False) -> Any:
+        return self._output
+
+
+class StubWeb:
+    """Serves synthetic pages for planned URLs instead of the internet"""
+
+    def __init__(self, profile: StubProfile, seed: int = 0):
+        self.profile = profile
+        self.seed = seed
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        rng = random.Random(zlib.crc32(f"{self.seed}:{request.url}".encode()))
+        await asyncio.sleep(self.profile.fetch.sample(rng))
+        if rng.random() < self.profile.js_pages:
+            body = '<div id="root"></div><script src="/app.js"></script>'
+        else:
+            paragraphs = [
+                _words(rng, 100) for _ in range(self.profile.page_words // 100)
+            ]
+            body = "".join(f"<p>{paragraph}</p>" for paragraph in paragraphs)
+        return httpx.Response(
+            200,
+            html=f"<html><head><title>Stub page</title></head><body>{body}</body></html>",
+        )
+
+    def client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(transport=httpx.MockTransport(self))
+
+
+class StubRunner:
+    """Replaces the Agents SDK Runner with deterministic local stand-ins.
+
+    Each call is seeded from the benchmark seed, the agent and its input, so
+    a given request produces the same outputs and latencies on every run
+    regardless of how calls interleave.
+    """
+
+    def __init__(self, profile: StubProfile, seed: int = 0):
+        self.profile = profile
+        self.seed = seed
+
+    def _rng(self, agent: Agent[Any], input: str) -> random.Random:
+        return random.Random(zlib.crc32(f"{self.seed}:{agent.name}:{input}".encode()))
+
+    async def run(self, agent: Agent[Any], input: str, **kwargs: Any) -> StubResult:
+        rng = self._rng(agent, input)
+        profile = self.profile
+        if agent is planner_agent:
+            await asyncio.sleep(profile.planner.sample(rng))
+            return StubResult(self._plan(rng, input))
+        if agent is search_agent:
+            await asyncio.sleep(profile.search.sample(rng))
+            return StubResult(_words(rng, profile.summary_words))
+        if agent is browser_agent:
+            await asyncio.sleep(profile.browser.sample(rng))
+            return StubResult(_words(rng, profile.browser_words))
+        raise ValueError(f"No stub for agent {agent.name!r}")
+
+    def run_streamed(
+        self, agent: Agent[Any], input: str, **kwargs: Any
+    ) -> StubStreamedResult:
+        if agent is not writer_agent:
+            raise ValueError(f"No streaming stub for agent {agent.name!r}")
+        rng = self._rng(agent, input)
+        return StubStreamedResult(
+            self._report(rng),
+            self.profile.writer.sample(rng),
+            self.profile.stream_chunk_chars,
+        )
+
+    def _plan(self, rng: random.Random, input: str) -> WebSearchPlan:
+        return WebSearchPlan(
+            searches=[
+                WebSearchItem(
+                    reason=_words(rng, 12),
+                    query=f"{input} {' '.join(rng.choices(WORDS, k=3))} {i}",
+                    url=f"https://{rng.choice(WORDS)}.example.com/{rng.getrandbits(32):08x}",
+                )
+                for i in range(self.profile.searches)
+            ]
+        )
+
+    def _report(self, rng: random.Random) -> ReportData:
+        charts = [
+            ChartRequest(
+                chart_type=rng.choice(["bar", "line", "pie"]),
+                title=f"Chart {i}",
+                data="| Category | Value |\n|---|---|\n"
+                + "\n".join(
+                    f"| {word} | {rng.randint(1, 500)} |"
+                    for word in rng.sample(WORDS, 6)
+                ),
+                description=_words(rng, 10),
+                position=f"chart_{i}",
+            )
+            for i in range(1, self.profile.charts + 1)
+        ]
+        paragraphs = [_words(rng, 150) for _ in range(self.profile.report_words // 150)]
+        for chart in charts:
+            paragraphs.insert(
+                rng.randint(0, len(paragraphs)), f"{{{{{chart.position}}}}}"
+            )
+        return ReportData(
+            short_summary=_words(rng, 40),
+            markdown_report="\n\n".join(paragraphs),
+            follow_up_questions=[_words(rng, 10) for _ in range(3)],
+            chart_requests=charts,
+        )
@@ -0,0 +1,253 @@
+from __future__ import annotations
+
+import logging
+import re
+import zlib
+from dataclasses import dataclass
+
+import numpy as np
+
+from ..config import Config
+from .agents.writer_agent import MODEL_NAME as WRITER_MODEL_NAME
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - the estimate below is close enough
+    tiktoken = None
+
+logger = logging.getLogger("deep_research_compaction")
+
+SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+|\n+")
+WORD = re.compile(r"\w+")
+
+
+@dataclass
+class Source:
+    label: str
+    text: str
+
+
+@dataclass
+class CompactedSources:
+    text: str
+    """Structured writer input, one section per source"""
+
+    tokens_before: int
+    tokens_after: int
+    duplicate_sources: int
+    duplicate_sentences: int
+    truncated_sentences: int
+
+    @property
+    def tokens_saved(self) -> int:
+        return max(self.tokens_before - self.tokens_after, 0)
+
+
+class TokenCounter:
+    """Counts tokens with tiktoken when available, otherwise estimates them.
+
+    tiktoken may download its encoding on first use, so it is loaded lazily
+    and any failure falls back to the estimate for the life of the process.
+    """
+
+    def __init__(self, model: str):
+        self.model = model
+        self._encoding = None
+        self._loaded = tiktoken is None
+
+    def _load(self) -> None:
+        self._loaded = True
+        try:
+            try:
+                self._encoding = tiktoken.encoding_for_model(self.model)
+            except KeyError:
+                self._encoding = tiktoken.get_encoding("o200k_base")
+        except Exception as e:
+            logger.warning("Falling back to estimated token counts: %s", e)
+
+    def __call__(self, text: str) -> int:
+        if not self._loaded:
+            self._load()
+        if self._encoding is not None:
+            return len(self._encoding.encode(text, disallowed_special=()))
+        return (len(text) + 3) // 4
+
+
+class MinHasher:
+    """MinHash signatures over word shingles for estimating Jaccard similarity"""
+
+    def __init__(self, num_perm: int = 64, shingle_size: int = 3, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        self.shingle_size = shingle_size
+        # Multiply-shift hashing: odd multipliers, arithmetic wraps modulo 2**64
+        self._a = rng.integers(0, 1 << 63, size=num_perm, dtype=np.uint64) * 2 + 1
+        self._b = rng.integers(0, 1 << 63, size=num_perm, dtype=np.uint64)
+
+    def shingles(self, text: str) -> set[str]:
+        words = WORD.findall(text.lower())
+        if len(words) <= self.shingle_size:
+            return {" ".join(words)} if words else set()
+        return {
+            " ".join(words[i : i + self.shingle_size])
+            for i in range(len(words) - self.shingle_size + 1)
+        }
+
+    def signature(self, text: str) -> np.ndarray | None:
+        shingles = self.shingles(text)
+        if not shingles:
+            return None
+        hashes = np.fromiter(
+            (zlib.crc32(s.encode()) for s in shingles),
+            dtype=np.uint64,
+            count=len(shingles),
+        )
+        permuted = (np.outer(hashes, self._a) + self._b) >> np.uint64(32)
+        return permuted.min(axis=0)
+
+
+class SignatureIndex:
+    """Signatures kept so far, compared in one vectorised pass per candidate"""
+
+    def __init__(self, num_perm: int):
+        self._signatures = np.empty((0, num_perm), dtype=np.uint64)
+
+    def max_similarity(self, signature: np.ndarray) -> float:
+        if not len(self._signatures):
+            return 0.0
+        return float((self._signatures == signature).mean(axis=1).max())
+
+    def add(self, signature: np.ndarray) -> None:
+        self._signatures = np.vstack([self._signatures, signature])
+
+
+class Compactor:
+    """Removes redundancy from the writer's sources and fits them to a token budget.
+
+    Sources that are near-copies of an earlier one are dropped outright, then
+    individual sentences already covered by an earlier source. The budget is split evenly
+    across the remaining sources and whatever a short source doesn't use is
+    shared among the longer ones, so one verbose source can't crowd out the rest.
+    """
+
+    def __init__(
+        self,
+        token_budget: int,
+        source_threshold: float,
+        sentence_threshold: float,
+        model: str,
+        num_perm: int = 64,
+    ):
+        self.token_budget = token_budget
+        self.source_threshold = source_threshold
+        self.sentence_threshold = sentence_threshold
+        self.count_tokens = TokenCounter(model)
+        self.hasher = MinHasher(num_perm=num_perm)
+        self.num_perm = num_perm
+
+    def compact(self, sources: list[Source], baseline: str) -> CompactedSources:
+        """Compact `sources`; `baseline` is the uncompacted input used to report savings"""
+        tokens_before = self.count_tokens(baseline)
+
+        kept_sources = SignatureIndex(self.num_perm)
+        kept_sentences = SignatureIndex(self.num_perm)
+        seen_exact: set[str] = set()
+        duplicate_sources = duplicate_sentences = 0
+        sections: list[tuple[Source, list[tuple[str, int]]]] = []
+
+        for source in sources:
+            signature = self.hasher.signature(source.text)
+            if signature is None:
+                continue
+            if kept_sources.max_similarity(signature) >= self.source_threshold:
+                duplicate_sources += 1
+                continue
+            kept_sources.add(signature)
+
+            sentences: list[tuple[str, int]] = []
+            for sentence in SENTENCE_SPLIT.split(source.text):
+                sentence = sentence.strip()
+                normalized = " ".join(WORD.findall(sentence.lower()))
+                if not normalized:
+                    continue
+                if normalized in seen_exact:
+                    duplicate_sentences += 1
+                    continue
+                seen_exact.add(normalized)
+                sentence_signature = self.hasher.signature(sentence)
+                if (
+                    len(normalized.split()) > self.hasher.shingle_size
+                    and kept_sentences.max_similarity(sentence_signature)
+                    >= self.sentence_threshold
+                ):
+                    duplicate_sentences += 1
+                    continue
+                kept_sentences.add(sentence_signature)
+                sentences.append((sentence, self.count_tokens(sentence)))
+            if sentences:
+                sections.append((source, sentences))
+            else:
+                duplicate_sources += 1
+
+        allowances = self._allocate([sum(t for _, t in s) for _, s in sections])
+        truncated_sentences = 0
+        rendered: list[str] = []
+        for index, ((source, sentences), allowance) in enumerate(
+            zip(sections, allowances), start=1
+        ):
+            kept: list[str] = []
+            used = 0
+            for sentence, tokens in sentences:
+                if used + tokens > allowance:
+                    truncated_sentences += 1
+                    continue
+                kept.append(sentence)
+                used += tokens
+            if kept:
+                rendered.append(
+                    f"### Source {index}: {source.label}\n" + " ".join(kept)
+                )
+
+        text = "\n\n".join(rendered)
+        result = CompactedSources(
+            text=text,
+            tokens_before=tokens_before,
+            tokens_after=self.count_tokens(text),
+            duplicate_sources=duplicate_sources,
+            duplicate_sentences=duplicate_sentences,
+            truncated_sentences=truncated_sentences,
+        )
+        logger.info(
+            "Compacted writer input from %d to %d tokens "
+            "(%d duplicate sources, %d duplicate sentences, %d over budget)",
+            result.tokens_before,
+            result.tokens_after,
+            duplicate_sources,
+            duplicate_sentences,
+            truncated_sentences,
+        )
+        return result
+
+    def _allocate(self, demands: list[int]) -> list[int]:
+        """Max-min fair split of the token budget across sources"""
+        allowances = [0] * len(demands)
+        remaining = self.token_budget
+        unsatisfied = sorted(range(len(demands)), key=lambda i: demands[i])
+        while unsatisfied:
+            share = remaining // len(unsatisfied)
+            i = unsatisfied[0]
+            if demands[i] > share:
+                for j in unsatisfied:
+                    allowances[j] = share
+                break
+            allowances[i] = demands[i]
+            remaining -= demands[i]
+            unsatisfied.pop(0)
+        return allowances
+
+
+writer_compactor = Compactor(
+    token_budget=Config.WRITER_INPUT_TOKEN_BUDGET,
+    source_threshold=Config.COMPACTION_SOURCE_THRESHOLD,
+    sentence_threshold=Config.COMPACTION_SENTENCE_THRESHOLD,
+    model=WRITER_MODEL_NAME,
+)
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any, AsyncIterator, Dict
+
+
+def format_sse_event(data: Dict[str, Any], event_id: int | None = None) -> str:
+    json_data = json.dumps(data, ensure_ascii=False)
+    if event_id is None:
+        return f"data: {json_data}\n\n"
+    return f"id: {event_id}\ndata: {json_data}\n\n"
+
+
+class EventLog:
+    """An append-only event log that any number of subscribers can follow.
+
+    Events get increasing ids starting at 1. Subscribers first replay the
+    events recorded after the id they resume from and then receive new events
+    live until the log is closed. With `max_events` set, only the most recent
+    events are kept, like a ring buffer.
+    """
+
+    def __init__(self, max_events: int | None = None):
+        self.max_events = max_events
+        self._events: list[Dict[str, Any]] = []
+        self._first_id = 1
+        self._closed = False
+        self._changed = asyncio.Event()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    @property
+    def last_id(self) -> int:
+        return self._first_id + len(self._events) - 1
+
+    def append(self, event: Dict[str, Any]) -> None:
+        if self._closed:
+            raise RuntimeError("Cannot append to a closed event log")
+        self._events.append(event)
+        if self.max_events is not None and len(self._events) > self.max_events:
+            del self._events[0]
+            self._first_id += 1
+        self._notify()
+
+    def close(self) -> None:
+        self._closed = True
+        self._notify()
+
+    def _notify(self) -> None:
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def subscribe(
+        self, after_id: int = 0
+    ) -> AsyncIterator[tuple[int, Dict[str, Any]]]:
+        """Yield `(event_id, event)` pairs for every event after `after_id`.
+
+        When events the subscriber hasn't seen were already dropped from a
+        bounded log, an `events_dropped` event takes their place, with the id of
+        the last dropped event so resuming after it picks up where it left off.
+        """
+        position = after_id
+        while True:
+            while position < self.last_id:
+                if position + 1 < self._first_id:
+                    dropped = self._first_id - 1 - position
+                    position = self._first_id - 1
+                    yield position, {
+                        "type": "events_dropped",
+                        "count": dropped,
+                        "message": f"{dropped} earlier events are no longer available",
+                    }
+                    continue
+                position += 1
+                yield position, self._events[position - self._first_id]
+            if self._closed:
+                return
+            await self._changed.wait()
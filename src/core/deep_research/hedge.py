@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from typing import Awaitable, Callable, TypeVar
+
+from ..config import Config
+
+T = TypeVar("T")
+
+
+class Hedger:
+    """Runs calls with a hedged duplicate once they exceed the observed tail latency.
+
+    Every call's latency is measured from the start of its first attempt, so
+    calls won by a hedge or cancelled while still running are recorded with
+    how long they had taken by then. Dropping those would cut the tail off the
+    rolling window and pull the delay down. When a call is slower than the
+    configured percentile of that window, a duplicate is started and
+    whichever finishes first wins; the other is cancelled.
+    """
+
+    def __init__(self, percentile: float, min_samples: int, window: int = 200):
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.hedges = 0
+        self.hedges_skipped = 0
+        self.hedge_wins = 0
+        self._samples: deque[float] = deque(maxlen=window)
+
+    def hedge_delay(self) -> float | None:
+        """Seconds to wait before hedging, or None until enough samples exist"""
+        if len(self._samples) < self.min_samples:
+            return None
+        ordered = sorted(self._samples)
+        index = min(int(len(ordered) * self.percentile), len(ordered) - 1)
+        return ordered[index]
+
+    async def run(
+        self,
+        call: Callable[[], Awaitable[T]],
+        reserve: Callable[[], Callable[[], None] | None] | None = None,
+    ) -> T:
+        """Run `call`, hedging it once it is slower than the hedge delay.
+
+        `reserve` takes capacity for the duplicate without waiting and returns
+        a function that gives it back, or None to skip the hedge when there is
+        no capacity to spare.
+        """
+
+        async def attempt(release: Callable[[], None] | None = None) -> T:
+            try:
+                return await call()
+            finally:
+                if release is not None:
+                    release()
+
+        started = time.perf_counter()
+        primary = asyncio.ensure_future(attempt())
+        pending: set[asyncio.Future[T]] = {primary}
+        measured = False
+        try:
+            delay = self.hedge_delay()
+            if delay is not None:
+                await asyncio.wait(pending, timeout=delay)
+                if not primary.done():
+                    release = reserve() if reserve is not None else None
+                    if reserve is not None and release is None:
+                        self.hedges_skipped += 1
+                    else:
+                        self.hedges += 1
+                        pending.add(asyncio.ensure_future(attempt(release)))
+
+            error: BaseException | None = None
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is not None:
+                        error = task.exception()
+                        continue
+                    if task is not primary:
+                        self.hedge_wins += 1
+                    measured = True
+                    return task.result()
+            raise error
+        except asyncio.CancelledError:
+            # Cut short, e.g. by a timeout: the call took at least this long
+            measured = True
+            raise
+        finally:
+            if measured:
+                self._samples.append(time.perf_counter() - started)
+            for task in pending:
+                task.cancel()
+
+    def stats(self) -> dict[str, float | int | None]:
+        return {
+            "samples": len(self._samples),
+            "hedge_delay": self.hedge_delay(),
+            "hedges": self.hedges,
+            "hedges_skipped": self.hedges_skipped,
+            "hedge_wins": self.hedge_wins,
+        }
+
+
+search_hedger = Hedger(
+    percentile=Config.SEARCH_HEDGE_PERCENTILE,
+    min_samples=Config.SEARCH_HEDGE_MIN_SAMPLES,
+)
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict
+
+from ..config import Config
+from ..metrics import metrics
+from .admission import AdmissionController, admission_controller
+from .events import EventLog
+from .manager import DeepResearchManager
+from .schemas import DeepResearchJob, DeepResearchResponse
+
+logger = logging.getLogger("deep_research_jobs")
+
+
+class JobQueueFull(Exception):
+    """Raised when no more jobs can be queued"""
+
+
+@dataclass
+class Job:
+    job_id: str
+    query: str
+    events: EventLog
+    status: str = "queued"
+    trace_id: str | None = None
+    result: Dict[str, Any] | None = None
+    error: str | None = None
+    created_at: float = field(default_factory=time.time)
+    finished_at: float | None = None
+
+    def snapshot(self) -> DeepResearchJob:
+        return DeepResearchJob(
+            job_id=self.job_id,
+            status=self.status,
+            query=self.query,
+            trace_id=self.trace_id,
+            result=(
+                DeepResearchResponse.model_validate(self.result)
+                if self.result is not None
+                else None
+            ),
+            error=self.error,
+        )
+
+
+class JobManager:
+    """Runs research jobs on a bounded pool of background workers.
+
+    Jobs outlive the HTTP request that submitted them, and each keeps a
+    bounded buffer of its events so clients can reconnect and resume. A job
+    counts against admission like any research request while it runs, and
+    stays queued until the admission controller has room for it.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        max_pending: int,
+        max_events: int,
+        retention_seconds: float,
+        manager_factory: Callable[[], DeepResearchManager] = DeepResearchManager,
+        admission: AdmissionController | None = None,
+    ):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.max_events = max_events
+        self.retention_seconds = retention_seconds
+        self.manager_factory = manager_factory
+        self.admission = admission or admission_controller
+        self._jobs: dict[str, Job] = {}
+        self._queue: asyncio.Queue[Job] | None = None
+        self._worker_tasks: list[asyncio.Task] = []
+
+    async def start(self) -> None:
+        if self._queue is not None:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_pending)
+        self._worker_tasks = [
+            asyncio.create_task(self._work(), name=f"research-worker-{i}")
+            for i in range(self.workers)
+        ]
+
+    async def close(self) -> None:
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+        self._queue = None
+
+    def submit(self, query: str) -> Job:
+        if self._queue is None:
+            raise RuntimeError("Job manager has not been started")
+        self._prune()
+        job = Job(
+            job_id=uuid.uuid4().hex,
+            query=query,
+            events=EventLog(max_events=self.max_events),
+        )
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise JobQueueFull(f"{self.max_pending} research jobs already queued")
+        self._jobs[job.job_id] = job
+        logger.info("Queued research job %s", job.job_id)
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        return self._jobs.get(job_id)
+
+    async def _work(self) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._run(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: Job) -> None:
+        admission = None
+        try:
+            admission = await self.admission.wait_admit()
+            job.status = "running"
+            async for event in self.manager_factory().run_events(job.query):
+                if event["type"] == "start":
+                    job.trace_id = event["trace_id"]
+                job.events.append(event)
+                if event["type"] == "complete":
+                    job.result = {
+                        key: event[key]
+                        for key in DeepResearchResponse.model_fields
+                        if key in event
+                    }
+            job.status = "completed"
+        except asyncio.CancelledError:
+            job.status = "failed"
+            job.error = "Job was cancelled"
+            raise
+        except Exception as e:
+            logger.error("Research job %s failed: %s", job.job_id, e, exc_info=True)
+            job.status = "failed"
+            job.error = str(e)
+            job.events.append({"type": "error", "message": job.error})
+        finally:
+            if admission is not None:
+                admission.release()
+            job.finished_at = time.time()
+            job.events.close()
+
+    def _prune(self) -> None:
+        """Forget finished jobs older than the retention period"""
+        cutoff = time.time() - self.retention_seconds
+        expired = [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job.finished_at is not None and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def stats(self) -> dict[str, Any]:
+        statuses: dict[str, int] = {}
+        for job in self._jobs.values():
+            statuses[job.status] = statuses.get(job.status, 0) + 1
+        return {
+            "workers": self.workers,
+            "pending": self._queue.qsize() if self._queue is not None else 0,
+            "jobs": statuses,
+        }
+
+
+job_manager = JobManager(
+    workers=Config.JOB_WORKERS,
+    max_pending=Config.JOB_MAX_PENDING,
+    max_events=Config.JOB_MAX_EVENTS,
+    retention_seconds=Config.JOB_RETENTION_SECONDS,
+)
+
+metrics.add_collector(
+    "deep_research_jobs_pending",
+    "Background research jobs waiting for a worker",
+    lambda: [("", {}, job_manager.stats()["pending"])],
+)
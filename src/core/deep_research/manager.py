@@ -2,83 +2,234 @@ from __future__ import annotations
 
 import asyncio
 import logging
-import json
-from typing import AsyncGenerator, Dict, Any
+import math
+import time
+import re
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, AsyncGenerator, Callable, Dict, Any
 
-from rich.console import Console
-
-from agents import Runner, custom_span, gen_trace_id, trace
+import numpy as np
+from agents import RunResult, custom_span, gen_trace_id, trace
+from openai.types.responses import ResponseTextDeltaEvent
 
 from .agents.planner_agent import WebSearchItem, WebSearchPlan, planner_agent
 from .agents.search_agent import search_agent
 from .agents.writer_agent import ReportData, writer_agent
 from .agents.browser_agent import browser_agent
-from .tools.chart_tool import ChartRequest, generate_chart
-from .printer import Printer
-
-logging.basicConfig(
-    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+from .tools.chart_tool import (
+    QUICKCHART_URL_LIMIT,
+    ChartRequest,
+    chart_executor,
+    generate_chart,
 )
-logger = logging.getLogger("deep_research_manager")
+from .tools.fetch import PageFetcher, page_fetcher
+from .progress import EventProgress, ProgressFactory, server_progress
+from .pipeline import StageGraph
+from .scheduler import AgentScheduler, agent_scheduler
+from .cache import SearchCache, search_cache
+from .report_cache import ReportCache, content_terms, report_cache, vectorize
+from .store import ResultStore, StoredResult, result_store
+from .compaction import Compactor, Source, writer_compactor
+from .events import EventLog, format_sse_event
+from .hedge import Hedger, search_hedger
+from .admission import AdmissionController, admission_controller
+from .metrics import (
+    chart_seconds,
+    chart_url_overflows,
+    flights_cancelled,
+    page_fetches,
+    requests_in_flight,
+    search_cache_hits,
+    search_outcomes,
+    search_seconds,
+    searches_planned,
+    searches_reused,
+    searches_trimmed,
+)
+from .utils import normalize_query, run_in_executor
+from ..config import Config
+from ..log import trace_id_var
+from .report_stream import ReportStreamParser
 
+if TYPE_CHECKING:
+    from .batch import ResearchBatch
 
-class DeepResearchManager:
-    def __init__(self):
-        self.console = Console()
-        self.printer = Printer(self.console)
+logger = logging.getLogger("deep_research_manager")
 
-    async def run(self, query: str) -> dict:
-        trace_id = gen_trace_id()
-        logger.info(f"Starting research with trace_id: {trace_id}")
-        logger.info(f"Query: {query}")
+CHART_PLACEHOLDER = re.compile(r"\{\{\s*([^{}]+?)\s*\}\}")
 
-        with trace("Research trace", trace_id=trace_id):
-            search_plan = await self._plan_searches(query)
-            search_results = await self._perform_searches(search_plan)
-            browser_results = await self._browse_web(query)
-            report = await self._write_report(query, search_results + browser_results)
 
-            logger.info(
-                f"Report generated with {len(report.chart_requests)} chart requests"
-            )
-            for i, chart in enumerate(report.chart_requests):
-                logger.info(
-                    f"Chart {i+1}: {chart.title} (Type: {chart.chart_type}, Position: {chart.position})"
-                )
+@dataclass
+class SearchResults:
+    summaries: list[str]
+    completed: list[WebSearchItem]
+    """The searches behind `summaries`, in the same order"""
 
-            processed_report = report.markdown_report
+    dropped: list[WebSearchItem]
+    """Planned searches that failed or were cut off by the quorum or deadline"""
 
-            # Process chart requests
-            for i, chart_request in enumerate(report.chart_requests):
-                logger.info(
-                    f"Processing chart request {i+1}/{len(report.chart_requests)}: {chart_request.title}"
-                )
-                chart_url = await self._generate_chart(chart_request)
-                markdown_chart = f"\n![{chart_request.title}]({chart_url})\n"
-                placeholder = f"{{{{{chart_request.position}}}}}"
-
-                if placeholder in processed_report:
-                    logger.info(f"Replacing placeholder {placeholder} with chart image")
-                    processed_report = processed_report.replace(
-                        placeholder, markdown_chart
-                    )
-                else:
-                    logger.warning(f"Placeholder {placeholder} not found in report")
 
-            logger.info("Research completed successfully")
-            return {
-                "trace_id": trace_id,
-                "report": processed_report,
-                "summary": report.short_summary,
-                "follow_up_questions": report.follow_up_questions,
-            }
+@dataclass
+class ResearchFlight:
+    """A single running research pipeline shared by every caller of the same query"""
+
+    trace_id: str
+    key: str
+    events: EventLog = field(default_factory=EventLog)
+    task: asyncio.Task = field(init=False)
+    subscribers: int = 0
 
-    async def run_stream(self, query: str) -> AsyncGenerator[str, None]:
-        trace_id = gen_trace_id()
-        logger.info(f"Starting streaming research with trace_id: {trace_id}")
-        logger.info(f"Query: {query}")
 
-        yield self._format_sse_event(
+class DeepResearchManager:
+    # In-flight research keyed by normalized query, shared by all managers
+    _flights: dict[str, ResearchFlight] = {}
+
+    def __init__(
+        self,
+        scheduler: AgentScheduler | None = None,
+        cache: SearchCache | None = None,
+        progress_factory: ProgressFactory | None = None,
+        hedger: Hedger | None = None,
+        compactor: Compactor | None = None,
+        fetcher: PageFetcher | None = None,
+        reports: ReportCache | None = None,
+        store: ResultStore | None = None,
+        batch: ResearchBatch | None = None,
+        admission: AdmissionController | None = None,
+    ):
+        self.progress_factory = progress_factory or server_progress
+        self.scheduler = scheduler or agent_scheduler
+        self.cache = cache or search_cache
+        self.hedger = hedger or search_hedger
+        self.compactor = compactor or writer_compactor
+        self.fetcher = fetcher or page_fetcher
+        self.reports = reports or report_cache
+        self.store = store or result_store
+        self.admission = admission or admission_controller
+        # Set when researching as part of a batch that shares plans and searches
+        self.batch = batch
+
+    async def run(self, query: str, parent: StoredResult | None = None) -> dict:
+        """Research a query, as a follow-up building on `parent` if given"""
+        cached = await self._cached(query) if parent is None else None
+        if cached is not None:
+            logger.info("Serving cached report with trace_id: %s", cached["trace_id"])
+            return cached
+        return await self._run_flight(query, parent)
+
+    async def _run_flight(self, query: str, parent: StoredResult | None = None) -> dict:
+        """Research a query through its flight, without looking for earlier reports"""
+        flight = self._join_flight(query, parent)
+        try:
+            # Shield the shared pipeline so one caller going away doesn't cancel
+            # it for everyone else attached to the same flight.
+            return await asyncio.shield(flight.task)
+        finally:
+            self._leave_flight(flight)
+
+    async def run_stream(
+        self, query: str, parent: StoredResult | None = None
+    ) -> AsyncGenerator[str, None]:
+        async for event in self.run_events(query, parent):
+            yield format_sse_event(event)
+
+    async def run_events(
+        self, query: str, parent: StoredResult | None = None
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """Yield the research events, ending with a `complete` event"""
+        cached = await self._cached(query) if parent is None else None
+        if cached is not None:
+            logger.info("Serving cached report with trace_id: %s", cached["trace_id"])
+            yield {"type": "complete", **cached, "message": "Served from cache"}
+            return
+
+        flight = self._join_flight(query, parent)
+        try:
+            async for _, event in flight.events.subscribe():
+                yield event
+            await asyncio.shield(flight.task)
+        finally:
+            self._leave_flight(flight)
+
+    async def _cached(self, query: str) -> dict | None:
+        """A reusable earlier report from the report cache or the result store"""
+        cached = self.reports.get(query)
+        if cached is not None:
+            return cached
+        try:
+            stored = await self.store.find(query, Config.REPORT_CACHE_TTL_SECONDS)
+        except Exception as e:
+            logger.error("Reading the result store failed: %s", e, exc_info=True)
+            return None
+        if stored is None:
+            return None
+        # Results outlive restarts in the store; warm the cache for the next caller
+        self.reports.set(query, stored.result)
+        return stored.result
+
+    def _join_flight(
+        self, query: str, parent: StoredResult | None = None
+    ) -> ResearchFlight:
+        """Attach to the in-flight research for this query, starting one if needed"""
+        key = normalize_query(query)
+        if parent is not None:
+            key = f"{parent.trace_id}:{key}"
+        if self.batch is not None:
+            # Batch flights depend on tasks the batch cancels when it finishes,
+            # so they're never shared with callers outside the batch
+            key = f"batch:{id(self.batch)}:{key}"
+        flight = self._flights.get(key)
+        if flight is not None:
+            logger.info("Joining in-flight research with trace_id: %s", flight.trace_id)
+            flight.subscribers += 1
+            requests_in_flight.inc()
+            return flight
+
+        flight = ResearchFlight(trace_id=gen_trace_id(), key=key, subscribers=1)
+        requests_in_flight.inc()
+        flight.task = asyncio.create_task(self._fly(query, flight, parent))
+        self._flights[key] = flight
+
+        def forget(_: asyncio.Task) -> None:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+
+        flight.task.add_done_callback(forget)
+        return flight
+
+    def _leave_flight(self, flight: ResearchFlight) -> None:
+        """Detach from a flight, cancelling it once nobody is waiting for it"""
+        flight.subscribers -= 1
+        requests_in_flight.dec()
+        if flight.subscribers > 0 or flight.task.done():
+            return
+
+        logger.info(
+            "Cancelling research with trace_id %s: all callers disconnected",
+            flight.trace_id,
+        )
+        if self._flights.get(flight.key) is flight:
+            del self._flights[flight.key]
+        flight.task.cancel()
+        flights_cancelled.inc()
+
+    async def _fly(
+        self, query: str, flight: ResearchFlight, parent: StoredResult | None = None
+    ) -> dict:
+        trace_id = flight.trace_id
+        trace_id_var.set(trace_id)
+        logger.info("Starting research with trace_id: %s", trace_id)
+        logger.info("Query: %s", query)
+        if parent is not None:
+            logger.info("Following up on research with trace_id: %s", parent.trace_id)
+
+        progress = EventProgress(self.progress_factory(trace_id))
+
+        def emit(event: Dict[str, Any]) -> None:
+            flight.events.append(event)
+            progress(event)
+
+        emit(
             {
                 "type": "start",
                 "trace_id": trace_id,
@@ -87,172 +238,629 @@ class DeepResearchManager:
             }
         )
 
-        with trace("Research trace", trace_id=trace_id):
-            yield self._format_sse_event(
+        try:
+            with trace("Research trace", trace_id=trace_id):
+                results = await self._build_pipeline(query, emit, parent).run()
+                report: ReportData = results["write"]
+
+                logger.info("Research completed successfully")
+                result = {
+                    "trace_id": trace_id,
+                    "report": results["charts"],
+                    "summary": report.short_summary,
+                    "follow_up_questions": report.follow_up_questions,
+                    "dropped_searches": [
+                        item.query for item in results["search"].dropped
+                    ],
+                }
+                # Reports missing some of their searches aren't worth reusing, and
+                # follow-ups are written in the context of their parent research
+                reusable = parent is None and not result["dropped_searches"]
+                if reusable:
+                    self.reports.set(query, result)
+                await self._save_result(query, result, results, reusable)
+                emit({"type": "complete", **result, "message": "Research completed"})
+                return result
+        finally:
+            flight.events.close()
+            progress.end()
+
+    async def _save_result(
+        self, query: str, result: dict, results: dict[str, Any], reusable: bool
+    ) -> None:
+        """Persist a finished result so it can be fetched again by trace id"""
+        search: SearchResults = results["search"]
+        report: ReportData = results["write"]
+        try:
+            await self.store.save(
+                query,
+                result,
+                searches=[
+                    {
+                        "query": item.query,
+                        "reason": item.reason,
+                        "url": item.url,
+                        "summary": summary,
+                    }
+                    for item, summary in zip(search.completed, search.summaries)
+                ],
+                charts=[
+                    {
+                        "position": self._chart_key(chart_request),
+                        "title": chart_request.title,
+                        "chart_type": chart_request.chart_type,
+                        "description": chart_request.description,
+                    }
+                    for chart_request in report.chart_requests
+                ],
+                reusable=reusable,
+            )
+        except Exception as e:
+            # The caller still gets the report; it just can't be fetched again
+            logger.error("Saving the result failed: %s", e, exc_info=True)
+
+    def _build_pipeline(
+        self,
+        query: str,
+        emit: Callable[[Dict[str, Any]], None] | None = None,
+        parent: StoredResult | None = None,
+    ) -> StageGraph:
+        """Build the research stage graph.
+
+        Once the plan is ready its URLs are read alongside the searches; their
+        results are compacted into the writer input, and charts wait for the
+        writer. Follow-ups only plan and run the searches their `parent`
+        hasn't answered, and the writer gets the parent's summaries as well.
+        """
+        # Searches the parent research already answered, with their summaries
+        answered = [
+            (
+                WebSearchItem(
+                    query=search["query"],
+                    reason=search.get("reason", ""),
+                    url=search.get("url", ""),
+                ),
+                search["summary"],
+            )
+            for search in (parent.searches if parent is not None else [])
+        ]
+
+        def notify(event: Dict[str, Any]) -> None:
+            if emit is not None:
+                emit(event)
+
+        async def plan() -> WebSearchPlan:
+            notify(
                 {
                     "type": "status_update",
                     "step": "planning",
                     "message": "Planning search strategy...",
                 }
             )
-
-            search_plan = await self._plan_searches(query)
-
-            yield self._format_sse_event(
+            if self.batch is not None and parent is None:
+                search_plan = await self.batch.plan(query, self)
+            else:
+                search_plan = await self._plan_searches(query, parent)
+            message = f"Planned {len(search_plan.searches)} searches"
+            if parent is not None:
+                search_plan = self._unanswered_searches(
+                    search_plan, [item for item, _ in answered]
+                )
+                message = (
+                    f"Planned {len(search_plan.searches)} new searches, "
+                    f"reusing {len(answered)} from the earlier research"
+                )
+            notify(
                 {
                     "type": "plan_complete",
                     "searches": [
                         {"query": item.query, "reason": item.reason, "url": item.url}
                         for item in search_plan.searches
                     ],
-                    "message": f"Planned {len(search_plan.searches)} searches",
+                    "message": message,
                 }
             )
+            return search_plan
 
-            yield self._format_sse_event(
+        async def search(plan: WebSearchPlan) -> SearchResults:
+            notify(
                 {
                     "type": "status_update",
                     "step": "searching",
                     "message": "Executing web search...",
                 }
             )
+            results = await self._perform_searches(plan, emit)
+            if answered:
+                results.completed[:0] = [item for item, _ in answered]
+                results.summaries[:0] = [summary for _, summary in answered]
+            return results
 
-            search_results = []
-            for i, item in enumerate(search_plan.searches):
-                yield self._format_sse_event(
-                    {
-                        "type": "search_started",
-                        "search_index": i,
-                        "query": item.query,
-                        "message": f"Searching: {item.query}",
-                    }
-                )
-
-                result = await self._search(item)
-                if result:
-                    search_results.append(result)
-                    yield self._format_sse_event(
-                        {
-                            "type": "search_complete",
-                            "search_index": i,
-                            "query": item.query,
-                            "result_summary": (
-                                result[:100] + "..." if len(result) > 100 else result
-                            ),
-                            "message": f"Search completed: {item.query}",
-                        }
-                    )
-
-            yield self._format_sse_event(
+        async def browse(plan: WebSearchPlan) -> list[Source]:
+            notify(
                 {
                     "type": "status_update",
-                    "step": "writing",
-                    "message": "Writing research report...",
+                    "step": "browsing",
+                    "message": "Reading planned pages...",
                 }
             )
+            pages = await self._read_pages(query, plan, emit)
+            notify({"type": "browse_complete", "message": "Browsing completed"})
+            return pages
 
-            report = await self._write_report(query, search_results)
-
-            processed_report = report.markdown_report
+        # Charts are started as soon as the writer has produced their request
+        chart_tasks: dict[str, asyncio.Task[str | None]] = {}
 
-            for i, chart_request in enumerate(report.chart_requests):
-                chart_url = await self._generate_chart(chart_request)
-                markdown_chart = f"\n![{chart_request.title}]({chart_url})\n"
-                placeholder = f"{{{{{chart_request.position}}}}}"
+        async def build_chart(chart_request: ChartRequest) -> str | None:
+            chart_url = await self._generate_chart(chart_request)
+            notify(
+                {
+                    "type": "chart_ready",
+                    "position": self._chart_key(chart_request),
+                    "placeholder": self._chart_placeholder(chart_request),
+                    "markdown": self._chart_markdown(chart_request, chart_url),
+                }
+            )
+            return chart_url
 
-                if placeholder in processed_report:
-                    processed_report = processed_report.replace(
-                        placeholder, markdown_chart
-                    )
+        def start_chart(chart_request: ChartRequest) -> None:
+            key = self._chart_key(chart_request)
+            if key not in chart_tasks:
+                chart_tasks[key] = asyncio.create_task(build_chart(chart_request))
 
-            final_result = {
-                "type": "complete",
-                "trace_id": trace_id,
-                "report": processed_report,
-                "summary": report.short_summary,
-                "follow_up_questions": report.follow_up_questions,
-                "message": "Research completed",
-            }
+        writer_query = query
+        if parent is not None:
+            writer_query = (
+                f"{query}\nThis follows up earlier research on: {parent.query}"
+            )
 
-            yield self._format_sse_event(final_result)
+        async def compact(search: SearchResults, browse: list[Source]) -> str:
+            sources = [
+                Source(label=f"Web search: {item.query}", text=summary)
+                for item, summary in zip(search.completed, search.summaries)
+            ] + browse
+            baseline = self._writer_input(
+                writer_query, str(search.summaries + [source.text for source in browse])
+            )
+            compacted = await run_in_executor(
+                None, self.compactor.compact, sources, baseline
+            )
+            notify(
+                {
+                    "type": "compaction_complete",
+                    "tokens_before": compacted.tokens_before,
+                    "tokens_after": compacted.tokens_after,
+                    "tokens_saved": compacted.tokens_saved,
+                    "message": f"Saved {compacted.tokens_saved} writer input tokens",
+                }
+            )
+            return compacted.text
 
-    async def _plan_searches(self, query: str) -> WebSearchPlan:
+        async def write(compact: str) -> ReportData:
+            notify(
+                {
+                    "type": "status_update",
+                    "step": "writing",
+                    "message": "Writing research report...",
+                }
+            )
+            try:
+                return await self._write_report(
+                    writer_query,
+                    compact,
+                    on_delta=lambda delta: notify(
+                        {"type": "report_delta", "delta": delta}
+                    ),
+                    on_chart=start_chart,
+                )
+            except BaseException:
+                for task in chart_tasks.values():
+                    task.cancel()
+                raise
+
+        async def charts(write: ReportData) -> str:
+            for chart_request in write.chart_requests:
+                start_chart(chart_request)
+            return await self._render_charts(write, chart_tasks)
+
+        pipeline = StageGraph()
+        pipeline.add_stage("plan", plan)
+        pipeline.add_stage("search", search, depends_on=("plan",))
+        pipeline.add_stage("browse", browse, depends_on=("plan",))
+        pipeline.add_stage("compact", compact, depends_on=("search", "browse"))
+        pipeline.add_stage("write", write, depends_on=("compact",))
+        pipeline.add_stage("charts", charts, depends_on=("write",))
+        return pipeline
+
+    async def _plan_searches(
+        self, query: str, parent: StoredResult | None = None
+    ) -> WebSearchPlan:
         logger.info("Planning searches")
-        result = await Runner.run(
-            planner_agent,
-            f"Query: {query}",
-        )
+        planner_input = f"Query: {query}"
+        if parent is not None:
+            answered = "\n".join(f"- {search['query']}" for search in parent.searches)
+            planner_input += (
+                f"\nThis follows up earlier research on: {parent.query}\n"
+                "These searches were already performed for it, so only plan "
+                "searches for what they don't cover, or none if they cover "
+                f"everything:\n{answered}"
+            )
+        limit = self.admission.plan_limit()
+        if limit < self.admission.max_searches:
+            planner_input += f"\nPlan at most {limit} searches, most important first."
+        result = await self.scheduler.run(planner_agent, planner_input)
         plan = result.final_output_as(WebSearchPlan)
-        logger.info(f"Search plan created with {len(plan.searches)} searches")
+        logger.info("Search plan created with %d searches", len(plan.searches))
+        searches_planned.inc(len(plan.searches))
+        # The planner orders searches by importance, so under load keep the first
+        if len(plan.searches) > limit:
+            logger.info(
+                "Trimming plan from %d to %d searches under load",
+                len(plan.searches),
+                limit,
+            )
+            searches_trimmed.inc(len(plan.searches) - limit)
+            plan = WebSearchPlan(searches=plan.searches[:limit])
         return plan
 
-    async def _perform_searches(self, search_plan: WebSearchPlan) -> list[str]:
-        logger.info(f"Performing {len(search_plan.searches)} searches")
+    def _unanswered_searches(
+        self, plan: WebSearchPlan, answered: list[WebSearchItem]
+    ) -> WebSearchPlan:
+        """Drop planned searches that closely match one that was already answered.
+
+        A match needs the same content words, numbers included, so e.g. a 2025
+        search is never answered by a 2023 one. Searches that also differ in
+        generic words must still be FOLLOW_UP_SEARCH_THRESHOLD similar.
+        """
+        if not answered:
+            return plan
+        dim = self.reports.dim
+        matrix = np.stack([vectorize(item.query, dim) for item in answered])
+        answered_terms = [content_terms(item.query) for item in answered]
+
+        def is_answered(item: WebSearchItem) -> bool:
+            scores = matrix @ vectorize(item.query, dim)
+            terms = content_terms(item.query)
+            return any(
+                score >= Config.FOLLOW_UP_SEARCH_THRESHOLD and terms == other
+                for score, other in zip(scores, answered_terms)
+            )
+
+        searches = [item for item in plan.searches if not is_answered(item)]
+        skipped = len(plan.searches) - len(searches)
+        if skipped:
+            logger.info(
+                "Skipping %d searches answered by the earlier research", skipped
+            )
+            searches_reused.inc(skipped)
+        return WebSearchPlan(searches=searches)
+
+    async def _perform_searches(
+        self,
+        search_plan: WebSearchPlan,
+        emit: Callable[[Dict[str, Any]], None] | None = None,
+    ) -> SearchResults:
+        """Run every planned search concurrently.
+
+        Events are emitted in the order searches actually finish; `search_index`
+        is the item's position in the plan so clients can match them up. Once
+        the quorum of searches has succeeded or the stage deadline passes, the
+        remaining searches are cancelled and reported as dropped.
+        """
+        searches = search_plan.searches
+        logger.info("Performing %d searches", len(searches))
+
+        def notify(event: Dict[str, Any]) -> None:
+            if emit is not None:
+                emit(event)
+
+        async def indexed_search(i: int, item: WebSearchItem) -> tuple[int, str | None]:
+            notify(
+                {
+                    "type": "search_started",
+                    "search_index": i,
+                    "query": item.query,
+                    "message": f"Searching: {item.query}",
+                }
+            )
+            if self.batch is not None:
+                return i, await self.batch.search(item, self._search)
+            return i, await self._search(item)
+
+        quorum = math.ceil(Config.SEARCH_QUORUM * len(searches))
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + Config.SEARCH_STAGE_TIMEOUT_SECONDS
+
         with custom_span("Search the web"):
-            search_tasks = [
-                asyncio.create_task(self._search(item)) for item in search_plan.searches
+            pending = {
+                asyncio.create_task(indexed_search(i, item))
+                for i, item in enumerate(searches)
+            }
+            summaries: dict[int, str] = {}
+            try:
+                while pending and len(summaries) < quorum:
+                    done, pending = await asyncio.wait(
+                        pending,
+                        timeout=max(deadline - loop.time(), 0),
+                        return_when=asyncio.FIRST_COMPLETED,
+                    )
+                    if not done:
+                        logger.warning(
+                            "Search stage deadline passed with %d searches pending",
+                            len(pending),
+                        )
+                        break
+                    for task in done:
+                        i, result = task.result()
+                        item = searches[i]
+                        if not result:
+                            continue
+                        summaries[i] = result
+                        notify(
+                            {
+                                "type": "search_complete",
+                                "search_index": i,
+                                "query": item.query,
+                                "result_summary": (
+                                    result[:100] + "..."
+                                    if len(result) > 100
+                                    else result
+                                ),
+                                "message": f"Search completed: {item.query}",
+                            }
+                        )
+            finally:
+                for task in pending:
+                    task.cancel()
+                search_outcomes.labels("dropped").inc(len(pending))
+
+            dropped = [
+                (i, item) for i, item in enumerate(searches) if i not in summaries
             ]
-            results = []
-            for task in asyncio.as_completed(search_tasks):
-                result = await task
-                if result is not None:
-                    results.append(result)
+            for i, item in dropped:
+                notify(
+                    {
+                        "type": "search_dropped",
+                        "search_index": i,
+                        "query": item.query,
+                        "message": f"Search dropped: {item.query}",
+                    }
+                )
 
-            logger.info(f"Completed {len(results)} searches successfully")
-            return results
+            logger.info(
+                "Completed %d searches successfully, dropped %d",
+                len(summaries),
+                len(dropped),
+            )
+            return SearchResults(
+                summaries=[summaries[i] for i in sorted(summaries)],
+                completed=[searches[i] for i in sorted(summaries)],
+                dropped=[item for _, item in dropped],
+            )
+
+    async def _hedged_search(self, input: str) -> RunResult:
+        """Run the search agent, hedging it within the model's concurrency limit.
+
+        The search is hedged once it holds a model slot, so queueing for the
+        slot doesn't count as latency. A hedged duplicate needs a slot of its
+        own and is skipped when none is free.
+        """
+        async with self.scheduler.slot(search_agent):
+            return await self.hedger.run(
+                lambda: self.scheduler.runner.run(search_agent, input),
+                reserve=lambda: self.scheduler.try_acquire(search_agent),
+            )
 
     async def _search(self, item: WebSearchItem) -> str | None:
-        logger.info(f"Searching for: {item.query}")
+        cached = self.cache.get(item.query)
+        if cached is not None:
+            logger.info("Search cache hit for: %s", item.query)
+            search_cache_hits.inc()
+            return cached
+
+        logger.info("Searching for: %s", item.query)
         input = f"Search term: {item.query}\nReason for searching: {item.reason}"
+        started = time.perf_counter()
+
+        def record(outcome: str) -> None:
+            search_seconds.labels(outcome).observe(time.perf_counter() - started)
+            search_outcomes.labels(outcome).inc()
+
         try:
-            result = await Runner.run(
-                search_agent,
-                input,
+            result = await asyncio.wait_for(
+                self._hedged_search(input), Config.SEARCH_TIMEOUT_SECONDS
             )
-            logger.info(f"Search completed for: {item.query}")
-            return str(result.final_output)
+            logger.info("Search completed for: %s", item.query)
+            summary = str(result.final_output)
+            self.cache.set(item.query, summary)
+            record("succeeded")
+            return summary
+        except asyncio.TimeoutError:
+            logger.warning("Search timed out for: %s", item.query)
+            record("timed_out")
+            return None
         except Exception as e:
-            logger.error(f"Search failed for: {item.query}. Error: {e}", exc_info=True)
+            logger.error(
+                "Search failed for: %s. Error: %s", item.query, e, exc_info=True
+            )
+            record("failed")
             return None
 
-    async def _write_report(self, query: str, search_results: list[str]) -> ReportData:
+    async def _write_report(
+        self,
+        query: str,
+        sources: str,
+        on_delta: Callable[[str], None] | None = None,
+        on_chart: Callable[[ChartRequest], None] | None = None,
+    ) -> ReportData:
+        """Stream the report from the writer agent.
+
+        `on_delta` receives report text as it is generated and `on_chart`
+        receives each chart request as soon as it has been fully written.
+        """
         logger.info("Writing report")
-        input = f"Original query: {query}\nSummarized search results: {search_results}"
-        result = await Runner.run(
-            writer_agent,
-            input,
-        )
+        input = self._writer_input(query, sources)
+        parser = ReportStreamParser()
+        async with self.scheduler.run_streamed(writer_agent, input) as result:
+            async for event in result.stream_events():
+                if event.type != "raw_response_event" or not isinstance(
+                    event.data, ResponseTextDeltaEvent
+                ):
+                    continue
+                text, chart_requests = parser.feed(event.data.delta)
+                if text and on_delta is not None:
+                    on_delta(text)
+                if on_chart is not None:
+                    for chart_request in chart_requests:
+                        on_chart(chart_request)
 
         logger.info("Report writing completed")
         return result.final_output_as(ReportData)
 
+    @staticmethod
+    def _writer_input(query: str, sources: str) -> str:
+        return f"Original query: {query}\nSummarized search results:\n{sources}"
+
     async def _generate_chart(self, chart_request: ChartRequest) -> str:
         """Generate a chart and return the chart URL or base64 image"""
-        logger.info(f"Generating chart: {chart_request.title}")
+        logger.info("Generating chart: %s", chart_request.title)
         with custom_span("Generate chart"):
             try:
-                chart_url = generate_chart(chart_request)
-                logger.info(f"Chart generated successfully: {chart_request.title}")
+                started = time.perf_counter()
+                chart_url = await run_in_executor(
+                    chart_executor, generate_chart, chart_request
+                )
+                chart_seconds.observe(time.perf_counter() - started)
+                if chart_url is not None and len(chart_url) > QUICKCHART_URL_LIMIT:
+                    chart_url_overflows.inc()
+                logger.info("Chart generated successfully: %s", chart_request.title)
                 return chart_url
             except Exception as e:
-                logger.error(f"Error generating chart: {e}", exc_info=True)
+                logger.error("Error generating chart: %s", e, exc_info=True)
                 return None
 
-    async def _browse_web(self, query: str) -> list[str]:
+    async def _render_charts(
+        self, report: ReportData, chart_tasks: dict[str, asyncio.Task[str | None]]
+    ) -> str:
+        """Wait for every requested chart and place them in the report"""
+        logger.info(
+            "Report generated with %d chart requests", len(report.chart_requests)
+        )
+        for i, chart in enumerate(report.chart_requests):
+            logger.info(
+                "Chart %d: %s (Type: %s, Position: %s)",
+                i + 1,
+                chart.title,
+                chart.chart_type,
+                chart.position,
+            )
+        chart_urls = await asyncio.gather(
+            *(
+                chart_tasks[self._chart_key(chart_request)]
+                for chart_request in report.chart_requests
+            )
+        )
+        charts = {
+            self._chart_key(chart_request): self._chart_markdown(
+                chart_request, chart_url
+            )
+            for chart_request, chart_url in zip(report.chart_requests, chart_urls)
+        }
+
+        # Substitute every placeholder in a single pass over the report
+        replaced: set[str] = set()
+
+        def replace(match: re.Match[str]) -> str:
+            key = match.group(1)
+            if key not in charts:
+                return match.group(0)
+            replaced.add(key)
+            return charts[key]
+
+        processed_report = CHART_PLACEHOLDER.sub(replace, report.markdown_report)
+        for key in charts.keys() - replaced:
+            logger.warning("Placeholder {{%s}} not found in report", key)
+        return processed_report
+
+    def _chart_key(self, chart_request: ChartRequest) -> str:
+        """The chart's position without the braces, e.g. `chart_1`"""
+        return chart_request.position.strip().strip("{}").strip()
+
+    def _chart_placeholder(self, chart_request: ChartRequest) -> str:
+        return f"{{{{{self._chart_key(chart_request)}}}}}"
+
+    def _chart_markdown(
+        self, chart_request: ChartRequest, chart_url: str | None
+    ) -> str:
+        return f"\n![{chart_request.title}]({chart_url})\n"
+
+    async def _read_pages(
+        self,
+        query: str,
+        search_plan: WebSearchPlan,
+        emit: Callable[[Dict[str, Any]], None] | None = None,
+    ) -> list[Source]:
+        """Fetch the planned URLs over HTTP, using the browser agent only for the rest.
+
+        The browser agent gets a single task covering every page that failed
+        or needs JavaScript, or the whole query if the plan has no URLs.
+        """
+        urls = list(
+            dict.fromkeys(item.url for item in search_plan.searches if item.url)
+        )
+        with custom_span("Fetch pages"):
+            pages = await asyncio.gather(*(self.fetcher.fetch(url) for url in urls))
+
+        sources: list[Source] = []
+        unreadable: list[str] = []
+        for page in pages:
+            if page.blocked:
+                outcome = "blocked"
+            elif page.error is not None:
+                outcome = "failed"
+            elif page.needs_browser:
+                outcome = "needs_browser"
+            else:
+                outcome = "succeeded"
+            page_fetches.labels(outcome).inc()
+            if outcome == "succeeded":
+                label = f"Page: {page.title or page.url} ({page.url})"
+                sources.append(Source(label=label, text=page.text))
+                message = f"Read {page.url}"
+            else:
+                if not page.blocked:
+                    unreadable.append(page.url)
+                reason = page.error or "needs a browser"
+                message = f"Could not read {page.url}: {reason}"
+            if emit is not None:
+                emit(
+                    {
+                        "type": "page_fetched",
+                        "url": page.url,
+                        "outcome": outcome,
+                        "message": message,
+                    }
+                )
+        logger.info("Fetched %d of %d planned pages", len(sources), len(urls))
+
+        if unreadable or not urls:
+            sources += [
+                Source(label="Browser findings", text=result)
+                for result in await self._browse_web(query, unreadable)
+            ]
+        return sources
+
+    async def _browse_web(self, query: str, urls: list[str] | None = None) -> list[str]:
         """Use the browser agent to search the web and return results"""
-        logger.info(f"Executing browse task: {query}")
+        logger.info("Executing browse task: %s", query)
+        input = f"Search query: {query}"
+        if urls:
+            input += "\nRead these pages: " + ", ".join(urls)
         try:
             with custom_span("Browse the web"):
-                result = await Runner.run(
-                    browser_agent,
-                    f"Search query: {query}",
-                )
+                result = await self.scheduler.run(browser_agent, input)
                 logger.info("Browse task completed")
                 return [str(result.final_output)]
         except Exception as e:
-            logger.error(f"Browse task failed: {e}", exc_info=True)
+            logger.error("Browse task failed: %s", e, exc_info=True)
             return []
-
-    def _format_sse_event(self, data: Dict[str, Any]) -> str:
-        json_data = json.dumps(data, ensure_ascii=False)
-        return f"data: {json_data}\n\n"
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from typing import Iterable
+
+from ..metrics import Sample, metrics
+from .pipeline import add_stage_observer
+from .scheduler import agent_scheduler
+
+stage_seconds = metrics.histogram(
+    "deep_research_stage_seconds",
+    "Duration of each research pipeline stage",
+    ["stage", "outcome"],
+)
+search_seconds = metrics.histogram(
+    "deep_research_search_seconds",
+    "Duration of a single web search, excluding cache hits",
+    ["outcome"],
+)
+chart_seconds = metrics.histogram(
+    "deep_research_chart_seconds",
+    "Duration of generating a single chart",
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+searches_planned = metrics.counter(
+    "deep_research_searches_planned", "Searches produced by the planner"
+)
+searches_reused = metrics.counter(
+    "deep_research_searches_reused",
+    "Follow-up searches skipped because the earlier research already answered them",
+)
+searches_trimmed = metrics.counter(
+    "deep_research_searches_trimmed",
+    "Planned searches cut from plans to keep up under load",
+)
+batch_searches_shared = metrics.counter(
+    "deep_research_batch_searches_shared",
+    "Batch searches answered by the same search run for another query of the batch",
+)
+search_outcomes = metrics.counter(
+    "deep_research_searches",
+    "Searches by outcome: succeeded, failed, timed_out or dropped",
+    ["outcome"],
+)
+search_cache_hits = metrics.counter(
+    "deep_research_search_cache_hits", "Searches answered from the search cache"
+)
+chart_url_overflows = metrics.counter(
+    "deep_research_chart_url_overflows",
+    "QuickChart URLs longer than browsers and the service reliably accept",
+)
+page_fetches = metrics.counter(
+    "deep_research_page_fetches",
+    "Planned pages fetched over HTTP by outcome: succeeded, needs_browser, failed "
+    "or blocked",
+    ["outcome"],
+)
+report_cache_lookups = metrics.counter(
+    "deep_research_report_cache_lookups",
+    "Report cache lookups by result: hit or miss",
+    ["result"],
+)
+report_cache_lookup_seconds = metrics.histogram(
+    "deep_research_report_cache_lookup_seconds",
+    "Time spent looking up similar past queries in the report cache",
+    buckets=(0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.05),
+)
+requests_in_flight = metrics.gauge(
+    "deep_research_requests_in_flight",
+    "Callers currently waiting on or streaming a research run",
+)
+flights_cancelled = metrics.counter(
+    "deep_research_flights_cancelled",
+    "Research runs cancelled because every caller went away before they finished",
+)
+
+
+def _observe_stage(stage: str, duration: float, failed: bool) -> None:
+    stage_seconds.labels(stage, "failed" if failed else "succeeded").observe(duration)
+
+
+def _agent_queues() -> Iterable[Sample]:
+    for model, stats in agent_scheduler.stats().items():
+        yield "", {"model": model, "state": "in_flight"}, stats["in_flight"]
+        yield "", {"model": model, "state": "queued"}, stats["queue_depth"]
+
+
+add_stage_observer(_observe_stage)
+metrics.add_collector(
+    "deep_research_agent_calls",
+    "Agent calls per model that hold a concurrency slot or wait for one",
+    _agent_queues,
+)
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+logger = logging.getLogger("deep_research_pipeline")
+
+StageObserver = Callable[[str, float, bool], None]
+"""Called with the stage name, its duration in seconds and whether it failed"""
+
+_stage_observers: list[StageObserver] = []
+
+
+def add_stage_observer(observer: StageObserver) -> None:
+    _stage_observers.append(observer)
+
+
+def remove_stage_observer(observer: StageObserver) -> None:
+    _stage_observers.remove(observer)
+
+
+@dataclass
+class Stage:
+    name: str
+    func: Callable[..., Awaitable[Any]]
+    """Coroutine function called with the results of its dependencies as keyword arguments"""
+
+    depends_on: tuple[str, ...] = field(default_factory=tuple)
+
+
+class StageGraph:
+    """A small DAG executor that starts every stage as soon as its inputs are ready"""
+
+    def __init__(self):
+        self._stages: dict[str, Stage] = {}
+
+    def add_stage(
+        self,
+        name: str,
+        func: Callable[..., Awaitable[Any]],
+        depends_on: tuple[str, ...] = (),
+    ) -> None:
+        if name in self._stages:
+            raise ValueError(f"Stage {name!r} is already defined")
+        self._stages[name] = Stage(name, func, tuple(depends_on))
+
+    def _ordered(self) -> list[Stage]:
+        """Return the stages in topological order, validating the graph"""
+        ordered: list[Stage] = []
+        visiting: set[str] = set()
+        visited: set[str] = set()
+
+        def visit(name: str) -> None:
+            if name in visited:
+                return
+            if name in visiting:
+                raise ValueError(f"Cycle detected at stage {name!r}")
+            if name not in self._stages:
+                raise ValueError(f"Unknown stage {name!r}")
+            visiting.add(name)
+            for dependency in self._stages[name].depends_on:
+                visit(dependency)
+            visiting.remove(name)
+            visited.add(name)
+            ordered.append(self._stages[name])
+
+        for name in self._stages:
+            visit(name)
+        return ordered
+
+    async def run(self) -> dict[str, Any]:
+        """Run every stage and return their results keyed by stage name.
+
+        The first failing stage cancels everything still running and its
+        exception is propagated to the caller.
+        """
+        tasks: dict[str, asyncio.Task] = {}
+        for stage in self._ordered():
+            dependencies = [tasks[name] for name in stage.depends_on]
+            tasks[stage.name] = asyncio.create_task(
+                self._run_stage(stage, dependencies), name=f"stage:{stage.name}"
+            )
+
+        try:
+            done, pending = await asyncio.wait(
+                tasks.values(), return_when=asyncio.FIRST_EXCEPTION
+            )
+            for task in done:
+                if not task.cancelled() and task.exception() is not None:
+                    raise task.exception()
+        finally:
+            for task in tasks.values():
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+
+        return {name: task.result() for name, task in tasks.items()}
+
+    async def _run_stage(self, stage: Stage, dependencies: list[asyncio.Task]) -> Any:
+        if dependencies:
+            await asyncio.wait(dependencies)
+        inputs = {
+            name: task.result() for name, task in zip(stage.depends_on, dependencies)
+        }
+        logger.debug("Starting stage: %s", stage.name)
+        started = time.perf_counter()
+        failed = True
+        try:
+            result = await stage.func(**inputs)
+            failed = False
+            return result
+        finally:
+            duration = time.perf_counter() - started
+            logger.debug("Finished stage: %s in %.3fs", stage.name, duration)
+            for observer in _stage_observers:
+                observer(stage.name, duration, failed)
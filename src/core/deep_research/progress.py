@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Callable, Dict, Protocol
+
+from rich.console import Console, Group
+from rich.live import Live
+from rich.spinner import Spinner
+from rich.table import Table
+
+from ..config import Config
+
+
+class ProgressSink(Protocol):
+    """Receives progress updates for a single research job"""
+
+    def update_item(
+        self,
+        item_id: str,
+        content: str,
+        is_done: bool = False,
+        hide_checkmark: bool = False,
+    ) -> None: ...
+
+    def mark_item_done(self, item_id: str) -> None: ...
+
+    def end(self) -> None: ...
+
+
+ProgressFactory = Callable[[str], ProgressSink]
+"""Creates the progress sink for a job given its trace id"""
+
+
+class NullProgress:
+    """Discards all progress, used when the server runs without a dashboard"""
+
+    def update_item(
+        self,
+        item_id: str,
+        content: str,
+        is_done: bool = False,
+        hide_checkmark: bool = False,
+    ) -> None:
+        pass
+
+    def mark_item_done(self, item_id: str) -> None:
+        pass
+
+    def end(self) -> None:
+        pass
+
+
+class ProgressDashboard:
+    """A single live view of every active research job.
+
+    Jobs only record their state; one rich refresh thread redraws the view at
+    a fixed rate, so updates never block on terminal I/O.
+    """
+
+    def __init__(self, console: Console, refresh_per_second: float):
+        self.console = console
+        self.refresh_per_second = refresh_per_second
+        self._jobs: dict[str, dict[str, tuple[str, bool]]] = {}
+        self._started_at: dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._live: Live | None = None
+
+    def start(self) -> None:
+        if self._live is not None:
+            return
+        self._live = Live(
+            console=self.console,
+            get_renderable=self._render,
+            refresh_per_second=self.refresh_per_second,
+            transient=True,
+        )
+        self._live.start()
+
+    def stop(self) -> None:
+        if self._live is not None:
+            self._live.stop()
+            self._live = None
+
+    def job(self, job_id: str) -> JobProgress:
+        with self._lock:
+            self._jobs[job_id] = {}
+            self._started_at[job_id] = time.monotonic()
+        return JobProgress(self, job_id)
+
+    def _update(self, job_id: str, item_id: str, content: str, is_done: bool) -> None:
+        with self._lock:
+            if job_id in self._jobs:
+                self._jobs[job_id][item_id] = (content, is_done)
+
+    def _remove(self, job_id: str) -> None:
+        with self._lock:
+            self._jobs.pop(job_id, None)
+            self._started_at.pop(job_id, None)
+
+    def _render(self) -> Any:
+        table = Table(title=f"Active research jobs: {len(self._jobs)}", expand=True)
+        table.add_column("Job", no_wrap=True)
+        table.add_column("Elapsed", justify="right")
+        table.add_column("Progress")
+
+        now = time.monotonic()
+        with self._lock:
+            for job_id, items in self._jobs.items():
+                steps = [
+                    content if is_done else Spinner("dots", text=content)
+                    for content, is_done in items.values()
+                ]
+                table.add_row(
+                    job_id,
+                    f"{now - self._started_at[job_id]:.0f}s",
+                    Group(*steps),
+                )
+        return table
+
+
+class JobProgress:
+    """A job's view onto the shared dashboard"""
+
+    def __init__(self, dashboard: ProgressDashboard, job_id: str):
+        self.dashboard = dashboard
+        self.job_id = job_id
+        self._items: dict[str, str] = {}
+
+    def update_item(
+        self,
+        item_id: str,
+        content: str,
+        is_done: bool = False,
+        hide_checkmark: bool = False,
+    ) -> None:
+        self._items[item_id] = content
+        self.dashboard._update(self.job_id, item_id, content, is_done)
+
+    def mark_item_done(self, item_id: str) -> None:
+        if item_id in self._items:
+            self.dashboard._update(self.job_id, item_id, self._items[item_id], True)
+
+    def end(self) -> None:
+        self.dashboard._remove(self.job_id)
+
+
+class EventProgress:
+    """Translates pipeline events into progress updates for a sink"""
+
+    def __init__(self, sink: ProgressSink):
+        self.sink = sink
+        self._started: set[str] = set()
+        self._searches_total = 0
+        self._searches_done = 0
+
+    def __call__(self, event: Dict[str, Any]) -> None:
+        kind = event["type"]
+        if kind == "start":
+            self.sink.update_item(
+                "trace_id",
+                f"View trace: https://platform.openai.com/traces/{event['trace_id']}",
+                is_done=True,
+                hide_checkmark=True,
+            )
+        elif kind == "status_update":
+            self._update(event["step"], event["message"])
+        elif kind == "plan_complete":
+            self._searches_total = len(event["searches"])
+            self._update("planning", event["message"], is_done=True)
+        elif kind in ("search_complete", "search_dropped"):
+            self._searches_done += 1
+            self._update(
+                "searching",
+                f"Searching... {self._searches_done}/{self._searches_total} completed",
+                is_done=self._searches_done == self._searches_total,
+            )
+        elif kind == "browse_complete":
+            self._update("browsing", event["message"], is_done=True)
+        elif kind == "compaction_complete":
+            self._update("compacting", event["message"], is_done=True)
+        elif kind == "complete":
+            for item_id in self._started:
+                self.sink.mark_item_done(item_id)
+
+    def _update(self, item_id: str, content: str, is_done: bool = False) -> None:
+        self._started.add(item_id)
+        self.sink.update_item(item_id, content, is_done=is_done)
+
+    def end(self) -> None:
+        self.sink.end()
+
+
+dashboard = ProgressDashboard(
+    Console(), refresh_per_second=Config.PROGRESS_DASHBOARD_REFRESH_PER_SECOND
+)
+
+
+def server_progress(job_id: str) -> ProgressSink:
+    """Progress for jobs started by the API: the shared dashboard, if enabled"""
+    if Config.PROGRESS_DASHBOARD:
+        return dashboard.job(job_id)
+    return NullProgress()
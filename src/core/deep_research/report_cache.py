@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import json
+import re
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+from ..config import Config
+from .metrics import report_cache_lookup_seconds, report_cache_lookups
+from .utils import normalize_query
+
+WORD = re.compile(r"\w+")
+STOPWORDS = frozenset(
+    "a an and are as at be by can do does for from how in into is it of on or the "
+    "to vs what when where which who why will with about".split()
+)
+# Words that say how to research something rather than what, so queries that
+# differ only in these still ask the same thing
+GENERIC_TERMS = frozenset(
+    "analyse analysis analyze brief comprehensive current deep detail detailed dive "
+    "explain explanation find give guide info information insight introduction key "
+    "latest look main me news overview please recent report research show study "
+    "summarize summary tell today update".split()
+)
+
+
+def _features(query: str) -> list[tuple[str, float]]:
+    """Order-insensitive features: content words plus their character trigrams"""
+    features: list[tuple[str, float]] = []
+    for word in WORD.findall(normalize_query(query)):
+        if word in STOPWORDS:
+            continue
+        word = _stem(word)
+        features.append((f"w:{word}", 1.0))
+        padded = f"<{word}>"
+        # Trigrams let related forms like "trend" and "trending" share some weight
+        features.extend((f"c:{padded[i:i + 3]}", 0.5) for i in range(len(padded) - 2))
+    return features
+
+
+def _stem(word: str) -> str:
+    """Strip plural endings only, so distinct words are never merged"""
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+
+def content_terms(query: str) -> frozenset[str]:
+    """Stemmed content words of a query, including any numbers but no generic words"""
+    stems = (
+        _stem(word)
+        for word in WORD.findall(normalize_query(query))
+        if word not in STOPWORDS
+    )
+    return frozenset(stem for stem in stems if stem not in GENERIC_TERMS)
+
+
+def vectorize(query: str, dim: int) -> np.ndarray:
+    """Hashed, signed and L2-normalised feature vector of a query"""
+    vector = np.zeros(dim, dtype=np.float32)
+    for feature, weight in _features(query):
+        h = zlib.crc32(feature.encode())
+        vector[h % dim] += weight if h & 0x80000000 else -weight
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+@dataclass
+class _Entry:
+    key: str
+    terms: frozenset[str]
+    """Content words of the query, which must all match for a hit"""
+
+    result: dict[str, Any]
+    expires_at: float
+    size: int
+    row: int
+
+
+class ReportCache:
+    """Serves finished reports for queries that are worded differently but mean the same.
+
+    Queries match regardless of word order, stopwords and plurals, but only
+    when both have the same content words: cosine similarity alone scores
+    "... in India" and "... in China" as near-duplicates. Generic words like
+    "latest" or "overview" may differ, and since the vectors include them,
+    `threshold` decides how much such rewording still counts. Query vectors live
+    in one preallocated matrix, so finding candidates is a single
+    matrix-vector product followed by a top-k selection. Entries expire
+    after `ttl_seconds` and the least recently used are evicted once the
+    reports and vectors exceed `max_bytes`.
+    """
+
+    def __init__(
+        self,
+        threshold: float,
+        ttl_seconds: float,
+        max_bytes: int,
+        top_k: int = 5,
+        dim: int = 4096,
+    ):
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.top_k = top_k
+        self.dim = dim
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lookup_seconds = 0.0
+        self._matrix = np.zeros((64, dim), dtype=np.float32)
+        self._rows: list[str] = []
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+
+    def get(self, query: str) -> dict[str, Any] | None:
+        started = time.perf_counter()
+        result = self._lookup(query)
+        elapsed = time.perf_counter() - started
+        self.lookup_seconds += elapsed
+        report_cache_lookup_seconds.observe(elapsed)
+        if result is None:
+            self.misses += 1
+            report_cache_lookups.labels("miss").inc()
+        else:
+            self.hits += 1
+            report_cache_lookups.labels("hit").inc()
+        return result
+
+    def _lookup(self, query: str) -> dict[str, Any] | None:
+        if not self._rows:
+            return None
+        vector = vectorize(query, self.dim)
+        terms = content_terms(query)
+        scores = self._matrix[: len(self._rows)] @ vector
+        k = min(self.top_k, len(scores))
+        candidates = np.argpartition(scores, -k)[-k:]
+        now = time.monotonic()
+        found: _Entry | None = None
+        expired: list[str] = []
+        for row in candidates[np.argsort(scores[candidates])[::-1]]:
+            if scores[row] < self.threshold:
+                break
+            entry = self._entries[self._rows[row]]
+            if entry.terms != terms:
+                continue
+            if entry.expires_at > now:
+                found = entry
+                break
+            expired.append(self._rows[row])
+
+        # Removing moves rows around, so only once the candidates are read
+        for key in expired:
+            self._remove(key)
+        if found is None:
+            return None
+        self._entries.move_to_end(found.key)
+        return found.result
+
+    def set(self, query: str, result: dict[str, Any]) -> None:
+        key = normalize_query(query)
+        size = len(json.dumps(result, default=str).encode()) + self.dim * 4
+        if size > self.max_bytes:
+            return
+
+        if key in self._entries:
+            self._remove(key)
+        row = len(self._rows)
+        if row == len(self._matrix):
+            self._matrix = np.vstack([self._matrix, np.zeros_like(self._matrix)])
+        self._matrix[row] = vectorize(query, self.dim)
+        self._rows.append(key)
+        self._entries[key] = _Entry(
+            key,
+            content_terms(query),
+            result,
+            time.monotonic() + self.ttl_seconds,
+            size,
+            row,
+        )
+        self.size_bytes += size
+
+        while self.size_bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._rows.clear()
+        self.size_bytes = 0
+
+    def _remove(self, key: str) -> None:
+        """Drop an entry, moving the last row into its place to keep the matrix dense"""
+        entry = self._entries.pop(key)
+        self.size_bytes -= entry.size
+        last = len(self._rows) - 1
+        if entry.row != last:
+            moved = self._rows[last]
+            self._matrix[entry.row] = self._matrix[last]
+            self._rows[entry.row] = moved
+            self._entries[moved].row = entry.row
+        self._rows.pop()
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "size_bytes": self.size_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "avg_lookup_ms": self.lookup_seconds / lookups * 1000 if lookups else 0.0,
+        }
+
+
+report_cache = ReportCache(
+    threshold=Config.REPORT_CACHE_THRESHOLD,
+    ttl_seconds=Config.REPORT_CACHE_TTL_SECONDS,
+    max_bytes=Config.REPORT_CACHE_MAX_BYTES,
+)
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import json
+import re
+
+from pydantic import ValidationError
+
+from .tools.chart_tool import ChartRequest
+
+_REPORT_START = re.compile(r'"markdown_report"\s*:\s*"')
+_CHARTS_START = re.compile(r'"chart_requests"\s*:\s*\[')
+_KEY_OVERLAP = 64
+_ESCAPES = {
+    '"': '"',
+    "\\": "\\",
+    "/": "/",
+    "b": "\b",
+    "f": "\f",
+    "n": "\n",
+    "r": "\r",
+    "t": "\t",
+}
+
+
+class ReportStreamParser:
+    """Incrementally extract report text and chart requests from the writer's JSON output.
+
+    The writer streams a `ReportData` object as raw JSON, so deltas are fed in
+    as they arrive and only newly decoded report text and chart requests that
+    became complete are returned.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._report_pos: int | None = None
+        self._report_done = False
+        self._charts_pos: int | None = None
+        self._charts_done = False
+        self._decoder = json.JSONDecoder()
+
+    def feed(self, delta: str) -> tuple[str, list[ChartRequest]]:
+        # Only rescan the tail of the buffer for keys that weren't found yet
+        search_from = max(0, len(self._buffer) - _KEY_OVERLAP)
+        self._buffer += delta
+        return self._read_report(search_from), self._read_charts(search_from)
+
+    def _read_report(self, search_from: int) -> str:
+        if self._report_done:
+            return ""
+        if self._report_pos is None:
+            match = _REPORT_START.search(self._buffer, search_from)
+            if match is None:
+                return ""
+            self._report_pos = match.end()
+
+        buffer = self._buffer
+        pos = self._report_pos
+        text: list[str] = []
+        while pos < len(buffer):
+            char = buffer[pos]
+            if char == '"':
+                self._report_done = True
+                pos += 1
+                break
+            if char != "\\":
+                text.append(char)
+                pos += 1
+                continue
+
+            # Wait for the rest of an escape sequence split across deltas
+            if pos + 1 >= len(buffer):
+                break
+            escape = buffer[pos + 1]
+            if escape != "u":
+                text.append(_ESCAPES.get(escape, escape))
+                pos += 2
+                continue
+            if pos + 6 > len(buffer):
+                break
+            code = int(buffer[pos + 2 : pos + 6], 16)
+            if 0xD800 <= code < 0xDC00:
+                if pos + 12 > len(buffer):
+                    break
+                if buffer[pos + 6 : pos + 8] == "\\u":
+                    low = int(buffer[pos + 8 : pos + 12], 16)
+                    text.append(chr(0x10000 + ((code - 0xD800) << 10) + (low - 0xDC00)))
+                    pos += 12
+                    continue
+            text.append(chr(code))
+            pos += 6
+
+        self._report_pos = pos
+        return "".join(text)
+
+    def _read_charts(self, search_from: int) -> list[ChartRequest]:
+        if self._charts_done:
+            return []
+        if self._charts_pos is None:
+            match = _CHARTS_START.search(self._buffer, search_from)
+            if match is None:
+                return []
+            self._charts_pos = match.end()
+
+        charts: list[ChartRequest] = []
+        while True:
+            pos = self._charts_pos
+            while pos < len(self._buffer) and self._buffer[pos] in " \t\r\n,":
+                pos += 1
+            self._charts_pos = pos
+            if pos >= len(self._buffer):
+                break
+            if self._buffer[pos] == "]":
+                self._charts_done = True
+                break
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, pos)
+            except json.JSONDecodeError:
+                break
+            self._charts_pos = end
+            try:
+                charts.append(ChartRequest.model_validate(value))
+            except ValidationError:
+                continue
+        return charts
@@ -1,25 +1,262 @@
-from fastapi import APIRouter
-from fastapi.responses import StreamingResponse
+import asyncio
+import json
+import logging
+from typing import AsyncGenerator
+
+from fastapi import APIRouter, Header, HTTPException, Request, Response
+from fastapi.responses import FileResponse, StreamingResponse
+from core.config import Config
+from core.deep_research.admission import Admission, Overloaded, admission_controller
+from core.deep_research.batch import ResearchBatch
+from core.deep_research.events import format_sse_event
+from core.deep_research.jobs import Job, JobQueueFull, job_manager
 from core.deep_research.manager import DeepResearchManager
-from core.deep_research.schemas import DeepResearchRequest, DeepResearchResponse
+from core.deep_research.schemas import (
+    DeepResearchBatchRequest,
+    DeepResearchJob,
+    DeepResearchRequest,
+    DeepResearchResponse,
+    StoredDeepResearch,
+)
+from core.deep_research.store import StoredResult, result_store
+from core.deep_research.tools.chart_store import MEDIA_TYPES, chart_store
+
+logger = logging.getLogger("deep_research_routes")
 
 deep_research_router = APIRouter()
 
+# How often streaming responses check whether the client is still connected
+DISCONNECT_POLL_SECONDS = 1.0
+
+
+async def stream_until_disconnected(
+    request: Request, events: AsyncGenerator[str, None]
+) -> AsyncGenerator[str, None]:
+    """Relay events until the client disconnects, then close the source stream.
+
+    Closing the source propagates cancellation into whatever produces the
+    events, even while it is waiting and nothing is being sent.
+    """
+
+    async def wait_for_disconnect() -> None:
+        while not await request.is_disconnected():
+            await asyncio.sleep(DISCONNECT_POLL_SECONDS)
+
+    disconnected = asyncio.create_task(wait_for_disconnect())
+    try:
+        while True:
+            next_event = asyncio.ensure_future(anext(events))
+            await asyncio.wait(
+                {next_event, disconnected}, return_when=asyncio.FIRST_COMPLETED
+            )
+            if not next_event.done():
+                logger.info("Client disconnected, cancelling stream")
+                next_event.cancel()
+                await asyncio.gather(next_event, return_exceptions=True)
+                break
+            try:
+                yield next_event.result()
+            except StopAsyncIteration:
+                break
+    finally:
+        disconnected.cancel()
+        await events.aclose()
+
+
+def admit_or_429(weight: int = 1) -> Admission:
+    try:
+        return admission_controller.admit(weight)
+    except Overloaded as e:
+        raise HTTPException(
+            status_code=429,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)},
+        )
+
+
+async def release_when_done(
+    admission: Admission, events: AsyncGenerator[str, None]
+) -> AsyncGenerator[str, None]:
+    """Relay a stream, releasing its admission once it ends or is closed"""
+    try:
+        async for event in events:
+            yield event
+    finally:
+        admission.release()
+        await events.aclose()
+
 
 @deep_research_router.post("/deep_research", response_model=DeepResearchResponse)
 async def create_deep_research(
     request: DeepResearchRequest,
 ) -> DeepResearchResponse:
-    manager = DeepResearchManager()
-    result = await manager.run(request.query)
-    return result
+    admission = admit_or_429()
+    try:
+        manager = DeepResearchManager()
+        return await manager.run(request.query)
+    finally:
+        admission.release()
 
 
 @deep_research_router.post("/deep_research_stream")
 async def create_deep_research_stream(
     request: DeepResearchRequest,
+    http_request: Request,
 ) -> StreamingResponse:
+    admission = admit_or_429()
     manager = DeepResearchManager()
     return StreamingResponse(
-        manager.run_stream(request.query), media_type="text/event-stream"
+        stream_until_disconnected(
+            http_request,
+            release_when_done(admission, manager.run_stream(request.query)),
+        ),
+        media_type="text/event-stream",
     )
+
+
+@deep_research_router.post("/deep_research/batch")
+async def create_deep_research_batch(
+    request: DeepResearchBatchRequest, http_request: Request
+) -> StreamingResponse:
+    """Research many queries at once, streaming one NDJSON line per finished query"""
+    if not request.queries:
+        raise HTTPException(status_code=422, detail="No queries given")
+    if len(request.queries) > Config.BATCH_MAX_QUERIES:
+        raise HTTPException(
+            status_code=422,
+            detail=f"At most {Config.BATCH_MAX_QUERIES} queries per batch",
+        )
+
+    # A batch holds a slot for each query it runs at once and each it plans ahead
+    admission = admit_or_429(min(len(request.queries), 2 * Config.BATCH_CONCURRENCY))
+    batch = ResearchBatch(request.queries, Config.BATCH_CONCURRENCY)
+
+    async def lines() -> AsyncGenerator[str, None]:
+        async for outcome in batch.run():
+            yield json.dumps(outcome, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(
+        stream_until_disconnected(http_request, release_when_done(admission, lines())),
+        media_type="application/x-ndjson",
+    )
+
+
+async def get_parent_or_404(trace_id: str) -> StoredResult:
+    parent = await result_store.get(trace_id)
+    if parent is None:
+        raise HTTPException(status_code=404, detail="Research not found")
+    return parent
+
+
+@deep_research_router.post(
+    "/deep_research/{trace_id}/follow_up", response_model=DeepResearchResponse
+)
+async def create_follow_up_research(
+    trace_id: str, request: DeepResearchRequest
+) -> DeepResearchResponse:
+    """Research a follow-up question, reusing the searches of an earlier report"""
+    parent = await get_parent_or_404(trace_id)
+    admission = admit_or_429()
+    try:
+        manager = DeepResearchManager()
+        return await manager.run(request.query, parent)
+    finally:
+        admission.release()
+
+
+@deep_research_router.post("/deep_research_stream/{trace_id}/follow_up")
+async def create_follow_up_research_stream(
+    trace_id: str, request: DeepResearchRequest, http_request: Request
+) -> StreamingResponse:
+    parent = await get_parent_or_404(trace_id)
+    admission = admit_or_429()
+    manager = DeepResearchManager()
+    return StreamingResponse(
+        stream_until_disconnected(
+            http_request,
+            release_when_done(admission, manager.run_stream(request.query, parent)),
+        ),
+        media_type="text/event-stream",
+    )
+
+
+@deep_research_router.post(
+    "/deep_research/jobs", response_model=DeepResearchJob, status_code=202
+)
+async def create_deep_research_job(request: DeepResearchRequest) -> DeepResearchJob:
+    try:
+        job = job_manager.submit(request.query)
+    except JobQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    return job.snapshot()
+
+
+def get_job_or_404(job_id: str) -> Job:
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Research job not found")
+    return job
+
+
+@deep_research_router.get(
+    "/deep_research/jobs/{job_id}", response_model=DeepResearchJob
+)
+async def get_deep_research_job(job_id: str) -> DeepResearchJob:
+    return get_job_or_404(job_id).snapshot()
+
+
+@deep_research_router.get("/deep_research/jobs/{job_id}/events")
+async def stream_deep_research_job(
+    job_id: str, http_request: Request, last_event_id: int = Header(default=0)
+) -> StreamingResponse:
+    """Stream a job's events, resuming after the `Last-Event-ID` header if given"""
+    job = get_job_or_404(job_id)
+
+    async def events() -> AsyncGenerator[str, None]:
+        async for event_id, event in job.events.subscribe(after_id=last_event_id):
+            yield format_sse_event(event, event_id)
+
+    # Disconnecting only stops the relay; the job itself keeps running
+    return StreamingResponse(
+        stream_until_disconnected(http_request, events()),
+        media_type="text/event-stream",
+    )
+
+
+@deep_research_router.get(
+    "/deep_research/{trace_id}", response_model=StoredDeepResearch
+)
+async def get_deep_research(trace_id: str, request: Request) -> Response:
+    if_none_match = request.headers.get("if-none-match", "")
+    stored = await result_store.get(trace_id, if_none_match)
+    if stored is None:
+        raise HTTPException(status_code=404, detail="Research not found")
+
+    # Clients revalidate with the ETag instead of downloading the report again
+    headers = {"ETag": stored.etag, "Cache-Control": "private, no-cache"}
+    if stored.result is None:
+        return Response(status_code=304, headers=headers)
+    research = StoredDeepResearch(
+        **stored.result,
+        query=stored.query,
+        created_at=stored.created_at,
+        searches=stored.searches,
+        charts=stored.charts,
+    )
+    return Response(
+        research.model_dump_json(), media_type="application/json", headers=headers
+    )
+
+
+@deep_research_router.get("/charts/{chart_id}")
+async def get_chart(chart_id: str, request: Request) -> Response:
+    path = chart_store.path(chart_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Chart not found")
+
+    # Chart ids are content hashes, so a stored chart never changes
+    etag = f'"{path.stem}"'
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=31536000, immutable"}
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+    return FileResponse(path, media_type=MEDIA_TYPES[path.suffix[1:]], headers=headers)
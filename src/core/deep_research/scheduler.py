@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable
+
+from agents import Agent, Runner, RunResult, RunResultStreaming
+
+from ..config import Config
+
+
+class ModelQueue:
+    """A FIFO concurrency limiter for a single model"""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_flight = 0
+        self.max_queue_depth = 0
+        self.total_calls = 0
+        self.total_wait_seconds = 0.0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+        # When each queued call started waiting, oldest first
+        self._waiting_since: dict[asyncio.Future[None], float] = {}
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    @property
+    def oldest_wait_seconds(self) -> float:
+        """How long the longest waiting call has been queued so far"""
+        for since in self._waiting_since.values():
+            return time.perf_counter() - since
+        return 0.0
+
+    async def acquire(self) -> None:
+        started = time.perf_counter()
+        if self.in_flight < self.limit and not self._waiters:
+            self.in_flight += 1
+        else:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            self._waiting_since[waiter] = started
+            self.max_queue_depth = max(self.max_queue_depth, len(self._waiters))
+            try:
+                # The releasing call hands its slot over directly, so in_flight
+                # is not incremented here and nobody can jump the queue.
+                await waiter
+            except asyncio.CancelledError:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                elif not waiter.cancelled():
+                    self.release()
+                raise
+            finally:
+                del self._waiting_since[waiter]
+
+        self.total_calls += 1
+        self.total_wait_seconds += time.perf_counter() - started
+
+    def try_acquire(self) -> bool:
+        """Take a free slot without queueing, or return False if there is none"""
+        if self.in_flight >= self.limit or self._waiters:
+            return False
+        self.in_flight += 1
+        self.total_calls += 1
+        return True
+
+    def release(self) -> None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "oldest_wait_seconds": self.oldest_wait_seconds,
+            "total_calls": self.total_calls,
+            "avg_wait_seconds": (
+                self.total_wait_seconds / self.total_calls if self.total_calls else 0.0
+            ),
+        }
+
+
+class AgentScheduler:
+    """Process-wide gate for agent runs with per-model concurrency caps.
+
+    Calls for the same model are admitted in FIFO order, so requests share
+    the model's capacity fairly instead of racing for it. `runner` executes
+    the admitted calls and can be replaced, e.g. by the benchmark's stubs.
+    """
+
+    def __init__(
+        self,
+        limits: dict[str, int],
+        default_limit: int,
+        default_model: str,
+        runner: Any = Runner,
+    ):
+        self.limits = dict(limits)
+        self.default_limit = default_limit
+        self.default_model = default_model
+        self.runner = runner
+        self._queues: dict[str, ModelQueue] = {}
+
+    def model_name(self, agent: Agent[Any]) -> str:
+        model = agent.model
+        if model is None:
+            return self.default_model
+        if isinstance(model, str):
+            return model
+        return str(getattr(model, "model", type(model).__name__))
+
+    def _queue(self, model: str) -> ModelQueue:
+        if model not in self._queues:
+            self._queues[model] = ModelQueue(self.limits.get(model, self.default_limit))
+        return self._queues[model]
+
+    @asynccontextmanager
+    async def slot(self, agent: Agent[Any]) -> AsyncIterator[None]:
+        queue = self._queue(self.model_name(agent))
+        await queue.acquire()
+        try:
+            yield
+        finally:
+            queue.release()
+
+    def try_acquire(self, agent: Agent[Any]) -> Callable[[], None] | None:
+        """Take a free slot for the agent's model without queueing.
+
+        Returns the function that releases it, or None when every slot is busy
+        or already promised to queued calls.
+        """
+        queue = self._queue(self.model_name(agent))
+        return queue.release if queue.try_acquire() else None
+
+    async def run(self, agent: Agent[Any], input: str, **kwargs: Any) -> RunResult:
+        async with self.slot(agent):
+            return await self.runner.run(agent, input, **kwargs)
+
+    @asynccontextmanager
+    async def run_streamed(
+        self, agent: Agent[Any], input: str, **kwargs: Any
+    ) -> AsyncIterator[RunResultStreaming]:
+        """Start a streamed run that holds the model slot until the stream is left"""
+        async with self.slot(agent):
+            result = self.runner.run_streamed(agent, input, **kwargs)
+            try:
+                yield result
+            finally:
+                if not result.is_complete:
+                    result.cancel()
+
+    def oldest_wait_seconds(self) -> float:
+        """The longest current queue wait across every model"""
+        return max(
+            (queue.oldest_wait_seconds for queue in self._queues.values()), default=0.0
+        )
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        return {model: queue.stats() for model, queue in self._queues.items()}
+
+
+agent_scheduler = AgentScheduler(
+    limits=Config.AGENT_CONCURRENCY_LIMITS,
+    default_limit=Config.AGENT_DEFAULT_CONCURRENCY,
+    default_model=Config.AGENT_DEFAULT_MODEL,
+)
@@ -1,3 +1,5 @@
+from datetime import datetime
+
 from pydantic import BaseModel
 
 
@@ -10,3 +12,41 @@ class DeepResearchResponse(BaseModel):
     report: str
     summary: str
     follow_up_questions: list[str]
+    dropped_searches: list[str] = []
+    """Planned searches that failed or didn't finish in time"""
+
+
+class DeepResearchBatchRequest(BaseModel):
+    queries: list[str]
+
+
+class SearchSummary(BaseModel):
+    query: str
+    reason: str = ""
+    url: str = ""
+    summary: str
+
+
+class ChartInfo(BaseModel):
+    position: str
+    title: str
+    chart_type: str
+    description: str
+
+
+class StoredDeepResearch(DeepResearchResponse):
+    query: str
+    created_at: datetime
+    searches: list[SearchSummary]
+    charts: list[ChartInfo]
+
+
+class DeepResearchJob(BaseModel):
+    job_id: str
+    status: str
+    """One of queued, running, completed or failed"""
+
+    query: str
+    trace_id: str | None = None
+    result: DeepResearchResponse | None = None
+    error: str | None = None
@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, TypeVar
+
+from ..config import Config
+from .utils import normalize_query, run_in_executor
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - gzip is always available
+    zstandard = None
+
+T = TypeVar("T")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    trace_id TEXT PRIMARY KEY,
+    query_key TEXT NOT NULL,
+    query TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    reusable INTEGER NOT NULL,
+    etag TEXT NOT NULL,
+    codec TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    payload BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_by_query ON results (query_key, created_at);
+"""
+
+
+def _compress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    return gzip.compress(data, compresslevel=6)
+
+
+def _decompress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError(
+                "Stored result is zstd compressed but zstandard is missing"
+            )
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+@dataclass
+class StoredResult:
+    trace_id: str
+    query: str
+    created_at: float
+    etag: str
+    result: dict[str, Any] | None = None
+    """The research response, or None when the caller already had this version"""
+
+    searches: list[dict[str, str]] | None = None
+    charts: list[dict[str, str]] | None = None
+
+
+class ResultStore:
+    """Completed research kept in a local SQLite database.
+
+    Results are keyed by trace id and indexed by normalized query. The report,
+    summaries, search summaries and chart metadata are stored as one
+    compressed JSON payload, with zstd when available and gzip otherwise; the
+    codec is recorded per row so either can be read back. SQLite calls run on
+    a single dedicated thread that owns the connection.
+    """
+
+    def __init__(self, path: str, codec: str = "zstd"):
+        self.path = path
+        if codec == "zstd" and zstandard is None:
+            codec = "gzip"
+        self.codec = codec
+        self.reads = 0
+        self.writes = 0
+        self.bytes_in = 0
+        self.bytes_stored = 0
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="result_store"
+        )
+        self._connection: sqlite3.Connection | None = None
+
+    async def _call(self, fn: Callable[..., T], *args: Any) -> T:
+        return await run_in_executor(self._executor, fn, *args)
+
+    def _db(self) -> sqlite3.Connection:
+        if self._connection is None:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(SCHEMA)
+            self._connection = connection
+        return self._connection
+
+    async def start(self) -> None:
+        await self._call(self._db)
+
+    async def close(self) -> None:
+        await self._call(self._close)
+
+    def _close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    async def save(
+        self,
+        query: str,
+        result: dict[str, Any],
+        searches: list[dict[str, str]],
+        charts: list[dict[str, str]],
+        reusable: bool = True,
+    ) -> str:
+        """Store a finished result and return its ETag.
+
+        Only `reusable` results are returned by `find` for later queries.
+        """
+        return await self._call(self._save, query, result, searches, charts, reusable)
+
+    def _save(
+        self,
+        query: str,
+        result: dict[str, Any],
+        searches: list[dict[str, str]],
+        charts: list[dict[str, str]],
+        reusable: bool,
+    ) -> str:
+        data = json.dumps(
+            {"result": result, "searches": searches, "charts": charts},
+            separators=(",", ":"),
+        ).encode()
+        etag = f'"{hashlib.sha256(data).hexdigest()[:32]}"'
+        payload = _compress(data, self.codec)
+        connection = self._db()
+        with connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    result["trace_id"],
+                    normalize_query(query),
+                    query,
+                    time.time(),
+                    reusable,
+                    etag,
+                    self.codec,
+                    len(data),
+                    payload,
+                ),
+            )
+        self.writes += 1
+        self.bytes_in += len(data)
+        self.bytes_stored += len(payload)
+        return etag
+
+    async def get(self, trace_id: str, if_none_match: str = "") -> StoredResult | None:
+        """Load a result by trace id.
+
+        When its ETag appears in `if_none_match` the payload isn't
+        decompressed and only the metadata is returned.
+        """
+        return await self._call(self._get, trace_id, if_none_match)
+
+    def _get(self, trace_id: str, if_none_match: str) -> StoredResult | None:
+        row = (
+            self._db()
+            .execute(
+                "SELECT trace_id, query, created_at, etag, codec, payload "
+                "FROM results WHERE trace_id = ?",
+                (trace_id,),
+            )
+            .fetchone()
+        )
+        if row is None:
+            return None
+        self.reads += 1
+        stored = StoredResult(*row[:4])
+        if stored.etag not in if_none_match:
+            self._load(stored, row[4], row[5])
+        return stored
+
+    async def find(self, query: str, max_age: float) -> StoredResult | None:
+        """The newest reusable result for the same normalized query"""
+        return await self._call(self._find, query, max_age)
+
+    def _find(self, query: str, max_age: float) -> StoredResult | None:
+        row = (
+            self._db()
+            .execute(
+                "SELECT trace_id, query, created_at, etag, codec, payload "
+                "FROM results WHERE query_key = ? AND reusable AND created_at > ? "
+                "ORDER BY created_at DESC LIMIT 1",
+                (normalize_query(query), time.time() - max_age),
+            )
+            .fetchone()
+        )
+        if row is None:
+            return None
+        self.reads += 1
+        stored = StoredResult(*row[:4])
+        self._load(stored, row[4], row[5])
+        return stored
+
+    @staticmethod
+    def _load(stored: StoredResult, codec: str, payload: bytes) -> None:
+        data = json.loads(_decompress(payload, codec))
+        stored.result = data["result"]
+        stored.searches = data["searches"]
+        stored.charts = data["charts"]
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "path": self.path,
+            "codec": self.codec,
+            "reads": self.reads,
+            "writes": self.writes,
+            "compression_ratio": (
+                self.bytes_in / self.bytes_stored if self.bytes_stored else 0.0
+            ),
+        }
+
+
+result_store = ResultStore(Config.RESULT_STORE_PATH, Config.RESULT_STORE_CODEC)
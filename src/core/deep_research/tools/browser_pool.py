@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+
+from browser_use import Browser, BrowserConfig
+from browser_use.browser.context import BrowserContext
+
+from ...config import Config
+
+logger = logging.getLogger("browser_pool")
+
+
+class PooledBrowser:
+    def __init__(self, browser: Browser | None):
+        self.browser = browser
+        self.uses = 0
+
+
+class BrowserPool:
+    """A fixed-size pool of warm browsers handing out isolated contexts.
+
+    Each task gets a fresh browser context on one of the pooled browsers.
+    Browsers are health-checked before use and recycled after `max_uses`
+    tasks so long-running processes don't accumulate browser state.
+    """
+
+    def __init__(self, size: int, max_uses: int, headless: bool):
+        self.size = size
+        self.max_uses = max_uses
+        self.headless = headless
+        self.launches = 0
+        self.recycled = 0
+        self._idle: asyncio.Queue[PooledBrowser] | None = None
+        self._pooled: list[PooledBrowser] = []
+        self._start_lock = asyncio.Lock()
+
+    async def start(self) -> None:
+        async with self._start_lock:
+            if self._idle is not None:
+                return
+            idle: asyncio.Queue[PooledBrowser] = asyncio.Queue()
+            launched = await asyncio.gather(*(self._launch() for _ in range(self.size)))
+            for pooled in launched:
+                self._pooled.append(pooled)
+                idle.put_nowait(pooled)
+            self._idle = idle
+
+    async def close(self) -> None:
+        async with self._start_lock:
+            await asyncio.gather(
+                *(self._close_browser(pooled) for pooled in self._pooled)
+            )
+            self._pooled.clear()
+            self._idle = None
+
+    @asynccontextmanager
+    async def context(self) -> AsyncIterator[tuple[Browser, BrowserContext]]:
+        """Borrow a pooled browser with a new, isolated context for one task"""
+        if self._idle is None:
+            await self.start()
+        idle = self._idle
+        pooled = await idle.get()
+        try:
+            if pooled.uses >= self.max_uses or not await self._healthy(pooled):
+                if pooled.browser is not None:
+                    self.recycled += 1
+                await self._close_browser(pooled)
+                await self._relaunch(pooled)
+            if pooled.browser is None:
+                raise RuntimeError("No browser available in the pool")
+
+            pooled.uses += 1
+            browser_context = await pooled.browser.new_context()
+            try:
+                yield pooled.browser, browser_context
+            finally:
+                await browser_context.close()
+        finally:
+            idle.put_nowait(pooled)
+
+    async def _launch(self) -> PooledBrowser:
+        pooled = PooledBrowser(None)
+        await self._relaunch(pooled)
+        return pooled
+
+    async def _relaunch(self, pooled: PooledBrowser) -> None:
+        pooled.uses = 0
+        browser = Browser(config=BrowserConfig(headless=self.headless))
+        try:
+            # Launch the browser process now rather than on first use
+            await browser.get_playwright_browser()
+        except Exception as e:
+            logger.error("Failed to launch browser: %s", e, exc_info=True)
+            await browser.close()
+            pooled.browser = None
+            return
+        self.launches += 1
+        pooled.browser = browser
+
+    async def _healthy(self, pooled: PooledBrowser) -> bool:
+        if pooled.browser is None:
+            return False
+        try:
+            playwright_browser = await pooled.browser.get_playwright_browser()
+            return playwright_browser.is_connected()
+        except Exception:
+            return False
+
+    async def _close_browser(self, pooled: PooledBrowser) -> None:
+        browser, pooled.browser = pooled.browser, None
+        if browser is None:
+            return
+        try:
+            await browser.close()
+        except Exception as e:
+            logger.warning("Failed to close browser: %s", e)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "size": self.size,
+            "idle": self._idle.qsize() if self._idle is not None else 0,
+            "launches": self.launches,
+            "recycled": self.recycled,
+        }
+
+
+browser_pool = BrowserPool(
+    size=Config.BROWSER_POOL_SIZE,
+    max_uses=Config.BROWSER_MAX_USES,
+    headless=Config.BROWSER_HEADLESS,
+)
@@ -0,0 +1,84 @@
+import io
+import re
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+_RGBA = re.compile(r"rgba?\(([^)]*)\)")
+
+
+def _parse_color(color: str) -> tuple[float, ...] | str:
+    """Convert a CSS `rgba(...)` color into a matplotlib RGBA tuple"""
+    match = _RGBA.fullmatch(color.strip())
+    if match is None:
+        return color
+    parts = [float(part) for part in match.group(1).split(",")]
+    red, green, blue = (part / 255 for part in parts[:3])
+    alpha = parts[3] if len(parts) > 3 else 1.0
+    return (red, green, blue, alpha)
+
+
+def _colors(colors: list[str] | str | None, count: int) -> list:
+    if not colors:
+        return [None] * count
+    if isinstance(colors, str):
+        colors = [colors]
+    parsed = [_parse_color(color) for color in colors]
+    return [parsed[i % len(parsed)] for i in range(count)]
+
+
+def load() -> None:
+    """Does nothing; running it in a worker process imports the renderer"""
+
+
+def render_chart(chart_config: dict, fmt: str = "png") -> bytes:
+    """Render a Chart.js style configuration to PNG or SVG with matplotlib"""
+    chart_type = chart_config.get("type", "bar")
+    labels = [str(label) for label in chart_config["data"]["labels"]]
+    dataset = chart_config["data"]["datasets"][0]
+    values = [float(value) for value in dataset["data"]]
+    fill = _colors(dataset.get("backgroundColor"), len(values))
+    edge = _colors(dataset.get("borderColor"), len(values))
+    title = (
+        chart_config.get("options", {})
+        .get("plugins", {})
+        .get("title", {})
+        .get("text", dataset.get("label", ""))
+    )
+
+    # The object-oriented API keeps rendering thread-safe (no pyplot state)
+    figure = Figure(figsize=(8, 5), dpi=100)
+    FigureCanvasAgg(figure)
+    axes = figure.add_subplot()
+
+    if chart_type in ("pie", "doughnut"):
+        wedge_props = {"width": 0.45} if chart_type == "doughnut" else None
+        axes.pie(
+            values,
+            labels=labels,
+            colors=fill,
+            wedgeprops=wedge_props,
+            autopct="%1.1f%%",
+        )
+        axes.axis("equal")
+    elif chart_type == "line":
+        axes.plot(labels, values, color=edge[0], marker="o", linewidth=2)
+        axes.set_ylim(bottom=min(0, *values))
+    elif chart_type == "scatter":
+        axes.scatter(labels, values, color=fill, edgecolors=edge)
+    else:
+        axes.bar(labels, values, color=fill, edgecolor=edge, linewidth=2)
+        axes.set_ylim(bottom=min(0, *values))
+
+    if chart_type not in ("pie", "doughnut"):
+        axes.grid(axis="y", color=(0, 0, 0, 0.1))
+        axes.spines[["top", "right"]].set_visible(False)
+        if len(labels) > 6:
+            axes.tick_params(axis="x", labelrotation=45)
+
+    axes.set_title(title, fontsize=18, pad=20)
+    figure.tight_layout()
+
+    output = io.BytesIO()
+    figure.savefig(output, format=fmt)
+    return output.getvalue()
@@ -0,0 +1,149 @@
+import hashlib
+import json
+import multiprocessing
+import os
+import re
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from pathlib import Path
+
+from ...config import Config
+from .chart_renderer import load, render_chart
+
+MEDIA_TYPES = {"png": "image/png", "svg": "image/svg+xml"}
+_CHART_ID = re.compile(r"^([0-9a-f]{32})\.(png|svg)$")
+
+# matplotlib holds the GIL while drawing, which would stall the event loop from
+# a thread, so charts are rendered in worker processes. Spawned workers don't
+# inherit the server's threads and event loop, and only import the renderer and
+# matplotlib since the `core` package itself doesn't load the application.
+render_executor = ProcessPoolExecutor(
+    max_workers=Config.CHART_WORKERS, mp_context=multiprocessing.get_context("spawn")
+)
+
+
+def start_render_workers() -> list[Future]:
+    """Start every render worker and import the renderer in the background.
+
+    Workers otherwise start with the first charts, which then wait for them to
+    import matplotlib. Returns a future per worker.
+    """
+    return [render_executor.submit(load) for _ in range(Config.CHART_WORKERS)]
+
+
+class ChartStore:
+    """Content-addressed storage for rendered charts.
+
+    Charts are keyed by a hash of their configuration and format, so an
+    identical chart is only ever rendered once. Rendering runs on `executor`
+    when given and in the calling thread otherwise. Once the stored charts
+    exceed `max_bytes`, the least recently stored or reused ones are deleted.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        executor: Executor | None = None,
+        max_bytes: int | None = None,
+    ):
+        self.directory = Path(directory)
+        self.executor = executor
+        self.max_bytes = max_bytes
+        self._locks: dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        # Bytes stored, counted from the directory on the first new chart
+        self._bytes: int | None = None
+        self._bytes_guard = threading.Lock()
+
+    def chart_id(self, chart_config: dict, fmt: str) -> str:
+        canonical = json.dumps(chart_config, sort_keys=True, separators=(",", ":"))
+        digest = hashlib.sha256(f"{fmt}:{canonical}".encode()).hexdigest()[:32]
+        return f"{digest}.{fmt}"
+
+    def put(self, chart_config: dict, fmt: str = "png") -> str:
+        """Render the chart unless it is already stored and return its id"""
+        if fmt not in MEDIA_TYPES:
+            raise ValueError(f"Unsupported chart format: {fmt}")
+
+        chart_id = self.chart_id(chart_config, fmt)
+        path = self.directory / chart_id
+        if self._touch(path):
+            return chart_id
+
+        try:
+            with self._lock(chart_id):
+                if not path.exists():
+                    content = self._render(chart_config, fmt)
+                    self.directory.mkdir(parents=True, exist_ok=True)
+                    temporary = path.with_name(f".{chart_id}.{threading.get_ident()}")
+                    temporary.write_bytes(content)
+                    os.replace(temporary, path)
+                    self._stored(len(content))
+        finally:
+            with self._locks_guard:
+                self._locks.pop(chart_id, None)
+        return chart_id
+
+    def _touch(self, path: Path) -> bool:
+        """Mark a stored chart as recently used, False if it isn't stored"""
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def _stored(self, size: int) -> None:
+        with self._bytes_guard:
+            if self._bytes is None:
+                self._bytes = sum(size for _, size, _ in self._charts())
+            else:
+                self._bytes += size
+            if self.max_bytes is not None and self._bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        # Down to three quarters of the limit, so the directory isn't listed
+        # again for every new chart once the store is full
+        target = self.max_bytes * 3 // 4
+        charts = sorted(self._charts())
+        total = sum(size for _, size, _ in charts)
+        for _, size, path in charts:
+            if total <= target:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+        self._bytes = total
+
+    def _charts(self) -> list[tuple[float, int, Path]]:
+        """Modification time, size and path of every stored chart"""
+        charts = []
+        for path in self.directory.iterdir():
+            if _CHART_ID.match(path.name) is None:
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            charts.append((stat.st_mtime, stat.st_size, path))
+        return charts
+
+    def _render(self, chart_config: dict, fmt: str) -> bytes:
+        if self.executor is None:
+            return render_chart(chart_config, fmt)
+        return self.executor.submit(render_chart, chart_config, fmt).result()
+
+    def path(self, chart_id: str) -> Path | None:
+        """Return the stored chart's path, or None for unknown or invalid ids"""
+        if _CHART_ID.match(chart_id) is None:
+            return None
+        path = self.directory / chart_id
+        return path if path.exists() else None
+
+    def _lock(self, chart_id: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(chart_id, threading.Lock())
+
+
+chart_store = ChartStore(
+    Config.CHART_STORE_DIR, render_executor, Config.CHART_STORE_MAX_BYTES
+)
@@ -4,15 +4,21 @@ import urllib.parse
 import pandas as pd
 import io
 import logging
-from rich.logging import RichHandler
+from concurrent.futures import ThreadPoolExecutor
+from ...config import Config
+from .chart_store import chart_store
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(message)s",
-    handlers=[RichHandler(rich_tracebacks=True)],
-)
 logger = logging.getLogger("chart_tool")
 
+# Longer QuickChart URLs are rejected by some browsers and proxies
+QUICKCHART_URL_LIMIT = 2000
+
+# Chart building parses tables with pandas and serializes large configs, so it
+# runs here instead of on the event loop.
+chart_executor = ThreadPoolExecutor(
+    max_workers=Config.CHART_WORKERS, thread_name_prefix="chart"
+)
+
 
 class ChartRequest(BaseModel):
     chart_type: str
@@ -56,10 +62,10 @@ def parse_markdown_table(markdown_table: str) -> pd.DataFrame:
     return df
 
 
-def generate_chart(chart_request: ChartRequest) -> str:
-    """Generate a chart image based on the request and return a chart URL"""
+def build_chart_config(chart_request: ChartRequest) -> dict | None:
+    """Parse the chart data and build a Chart.js style chart configuration"""
     logger.info(
-        f"📊 Generating {chart_request.chart_type} chart: {chart_request.title}"
+        "📊 Generating %s chart: %s", chart_request.chart_type, chart_request.title
     )
 
     try:
@@ -88,115 +94,127 @@ def generate_chart(chart_request: ChartRequest) -> str:
 
         # Get chart type
         chart_type = chart_request.chart_type.lower()
-        logger.info(f"Processing chart type: {chart_type}")
-
-        try:
-            # Extract labels and data
-            if len(df.columns) >= 2:
-                labels = df[df.columns[0]].tolist()
-                values = df[df.columns[1]].tolist()
-                logger.info(
-                    f"Using column '{df.columns[0]}' for labels and '{df.columns[1]}' for values"
-                )
-                logger.info(f"Labels: {labels[:5]}{'...' if len(labels) > 5 else ''}")
-                logger.info(f"Values: {values[:5]}{'...' if len(values) > 5 else ''}")
-            else:
-                labels = [f"Item {i}" for i in range(len(df))]
-                values = df[df.columns[0]].tolist()
-                logger.info(
-                    f"Using generated labels and column '{df.columns[0]}' for values"
-                )
-                logger.info(
-                    f"Generated labels: {labels[:5]}{'...' if len(labels) > 5 else ''}"
-                )
-                logger.info(f"Values: {values[:5]}{'...' if len(values) > 5 else ''}")
-
-            # Map chart type to QuickChart type
-            qc_type = "bar"
-            if "line" in chart_type:
-                qc_type = "line"
-            elif "pie" in chart_type:
-                qc_type = "pie"
-            elif "scatter" in chart_type:
-                qc_type = "scatter"
-            elif "doughnut" in chart_type:
-                qc_type = "doughnut"
-            logger.info(f"Mapped chart type to: {qc_type}")
-
-            # Create chart configuration
-            chart_config = {
-                "type": qc_type,
-                "data": {
-                    "labels": labels,
-                    "datasets": [
-                        {
-                            "label": chart_request.title,
-                            "data": values,
-                            "backgroundColor": [
-                                "rgba(54, 162, 235, 0.5)",
-                                "rgba(255, 99, 132, 0.5)",
-                                "rgba(75, 192, 192, 0.5)",
-                                "rgba(255, 206, 86, 0.5)",
-                                "rgba(153, 102, 255, 0.5)",
-                                "rgba(255, 159, 64, 0.5)",
-                            ],
-                            "borderColor": [
-                                "rgba(54, 162, 235, 1)",
-                                "rgba(255, 99, 132, 1)",
-                                "rgba(75, 192, 192, 1)",
-                                "rgba(255, 206, 86, 1)",
-                                "rgba(153, 102, 255, 1)",
-                                "rgba(255, 159, 64, 1)",
-                            ],
-                            "borderWidth": 2,
-                        }
-                    ],
-                },
-                "options": {
-                    "responsive": True,
-                    "maintainAspectRatio": True,
-                    "plugins": {
-                        "title": {
-                            "display": True,
-                            "text": chart_request.title,
-                            "font": {"size": 18, "family": "Arial"},
-                            "padding": 20,
-                        },
-                        "legend": {"display": True, "position": "bottom"},
+        logger.debug("Processing chart type: %s", chart_type)
+
+        # Extract labels and data
+        if len(df.columns) >= 2:
+            labels = df[df.columns[0]].tolist()
+            values = df[df.columns[1]].tolist()
+            logger.debug(
+                "Using column '%s' for labels and '%s' for values",
+                df.columns[0],
+                df.columns[1],
+            )
+        else:
+            labels = [f"Item {i}" for i in range(len(df))]
+            values = df[df.columns[0]].tolist()
+            logger.debug(
+                "Using generated labels and column '%s' for values", df.columns[0]
+            )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Labels: %s%s", labels[:5], "..." if len(labels) > 5 else "")
+            logger.debug("Values: %s%s", values[:5], "..." if len(values) > 5 else "")
+
+        # Map chart type to QuickChart type
+        qc_type = "bar"
+        if "line" in chart_type:
+            qc_type = "line"
+        elif "pie" in chart_type:
+            qc_type = "pie"
+        elif "scatter" in chart_type:
+            qc_type = "scatter"
+        elif "doughnut" in chart_type:
+            qc_type = "doughnut"
+        logger.debug("Mapped chart type to: %s", qc_type)
+
+        # Create chart configuration
+        chart_config = {
+            "type": qc_type,
+            "data": {
+                "labels": labels,
+                "datasets": [
+                    {
+                        "label": chart_request.title,
+                        "data": values,
+                        "backgroundColor": [
+                            "rgba(54, 162, 235, 0.5)",
+                            "rgba(255, 99, 132, 0.5)",
+                            "rgba(75, 192, 192, 0.5)",
+                            "rgba(255, 206, 86, 0.5)",
+                            "rgba(153, 102, 255, 0.5)",
+                            "rgba(255, 159, 64, 0.5)",
+                        ],
+                        "borderColor": [
+                            "rgba(54, 162, 235, 1)",
+                            "rgba(255, 99, 132, 1)",
+                            "rgba(75, 192, 192, 1)",
+                            "rgba(255, 206, 86, 1)",
+                            "rgba(153, 102, 255, 1)",
+                            "rgba(255, 159, 64, 1)",
+                        ],
+                        "borderWidth": 2,
+                    }
+                ],
+            },
+            "options": {
+                "responsive": True,
+                "maintainAspectRatio": True,
+                "plugins": {
+                    "title": {
+                        "display": True,
+                        "text": chart_request.title,
+                        "font": {"size": 18, "family": "Arial"},
+                        "padding": 20,
                     },
-                    "scales": {
-                        "y": {
-                            "beginAtZero": True,
-                            "grid": {"display": True, "color": "rgba(0, 0, 0, 0.1)"},
-                        },
-                        "x": {"grid": {"display": False}},
+                    "legend": {"display": True, "position": "bottom"},
+                },
+                "scales": {
+                    "y": {
+                        "beginAtZero": True,
+                        "grid": {"display": True, "color": "rgba(0, 0, 0, 0.1)"},
                     },
+                    "x": {"grid": {"display": False}},
                 },
-            }
-            logger.info("Chart configuration created successfully")
+            },
+        }
+        logger.debug("Chart configuration created successfully")
+        return chart_config
 
-            try:
-                config_json = json.dumps(chart_config)
-                encoded_config = urllib.parse.quote_plus(config_json)
-                chart_url = f"https://quickchart.io/chart?c={encoded_config}"
+    except Exception as e:
+        logger.error("❌ Chart generation failed: %s", e)
+        return None
 
-                if len(chart_url) > 2000:
-                    logger.warning(
-                        "⚠️ Chart URL exceeds length limit, trying to compress data"
-                    )
 
-                logger.debug("✅ Chart URL generated successfully")
-                return chart_url
+def quickchart_url(chart_config: dict) -> str | None:
+    """Encode the chart configuration into a QuickChart URL"""
+    try:
+        config_json = json.dumps(chart_config)
+        encoded_config = urllib.parse.quote_plus(config_json)
+        chart_url = f"https://quickchart.io/chart?c={encoded_config}"
 
-            except Exception as e:
-                logger.error(f"❌ Chart URL generation failed: {str(e)}")
-                logger.debug(f"Config JSON: {config_json[:100]}...")
-                return None
+        if len(chart_url) > QUICKCHART_URL_LIMIT:
+            logger.warning("⚠️ Chart URL exceeds length limit, trying to compress data")
 
-        except Exception as e:
-            logger.error(f"❌ Chart generation failed: {str(e)}")
-            return None
+        logger.debug("✅ Chart URL generated successfully")
+        return chart_url
 
     except Exception as e:
-        logger.error(f"❌ Chart generation failed: {str(e)}")
+        logger.error("❌ Chart URL generation failed: %s", e)
+        return None
+
+
+def generate_chart(chart_request: ChartRequest) -> str | None:
+    """Generate a chart image based on the request and return a chart URL"""
+    chart_config = build_chart_config(chart_request)
+    if chart_config is None:
         return None
+
+    if Config.CHART_RENDERER == "local":
+        try:
+            chart_id = chart_store.put(chart_config, Config.CHART_FORMAT)
+            logger.debug("✅ Chart stored as %s", chart_id)
+            return f"{Config.CHART_BASE_URL.rstrip('/')}/{chart_id}"
+        except Exception as e:
+            logger.error("❌ Local chart rendering failed, using QuickChart: %s", e)
+
+    return quickchart_url(chart_config)
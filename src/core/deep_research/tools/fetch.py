@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import asyncio
+import codecs
+import logging
+import re
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from html.parser import HTMLParser
+from typing import AsyncIterator
+from urllib.parse import urlsplit
+
+import httpx
+
+from ...clients import clients
+from ...config import Config
+from ...egress import BlockedAddress
+
+logger = logging.getLogger("fetch_tool")
+
+TEXT_CONTENT_TYPES = ("text/html", "application/xhtml+xml", "text/plain")
+
+# Elements whose content is never readable page text
+SKIPPED_TAGS = {"script", "style", "noscript", "template", "svg", "head", "iframe"}
+BLOCK_TAGS = {
+    "p", "div", "section", "article", "main", "header", "footer", "li", "ul",
+    "ol", "table", "tr", "br", "h1", "h2", "h3", "h4", "h5", "h6", "pre",
+    "blockquote", "dd", "dt",
+}  # fmt: skip
+WHITESPACE = re.compile(r"[ \t\r\f\v]+")
+
+
+class TextExtractor(HTMLParser):
+    """Incrementally turns HTML into readable text, stopping at `max_chars`"""
+
+    def __init__(self, max_chars: int):
+        super().__init__(convert_charrefs=True)
+        self.max_chars = max_chars
+        self.title = ""
+        self._parts: list[str] = []
+        self._chars = 0
+        self._skipping = 0
+        self._in_title = False
+
+    @property
+    def full(self) -> bool:
+        return self._chars >= self.max_chars
+
+    def handle_starttag(self, tag: str, attrs: list) -> None:
+        if tag == "title":
+            self._in_title = True
+        elif tag == "body":
+            # Recover from an unclosed <head>
+            self._skipping = 0
+        elif tag in SKIPPED_TAGS:
+            self._skipping += 1
+        elif tag in BLOCK_TAGS:
+            self._parts.append("\n")
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == "title":
+            self._in_title = False
+        elif tag in SKIPPED_TAGS:
+            self._skipping = max(self._skipping - 1, 0)
+        elif tag in BLOCK_TAGS:
+            self._parts.append("\n")
+
+    def handle_data(self, data: str) -> None:
+        if self._in_title:
+            self.title += data
+            return
+        if self._skipping or self.full:
+            return
+        data = WHITESPACE.sub(" ", data)
+        if data.strip():
+            self._parts.append(data)
+            self._chars += len(data)
+
+    def text(self) -> str:
+        lines = (line.strip() for line in "".join(self._parts).splitlines())
+        return "\n".join(line for line in lines if line)[: self.max_chars]
+
+
+@dataclass
+class FetchedPage:
+    url: str
+    text: str | None = None
+    title: str = ""
+    needs_browser: bool = False
+    """The page couldn't be read without a browser, e.g. it is rendered by JavaScript"""
+
+    error: str | None = None
+    blocked: bool = False
+    """The URL points at a non-public address, so no browser may read it either"""
+
+
+@dataclass
+class _Host:
+    slot: asyncio.Semaphore
+    users: int = 0
+
+
+class PageFetcher:
+    """Reads planned URLs over plain HTTP, which is enough for most static pages.
+
+    Responses are streamed through the HTML parser and abandoned once either
+    `max_bytes` have been read or `max_chars` of text extracted, and each host
+    gets at most `per_host_limit` concurrent requests so a plan that points
+    at one site doesn't hammer it. A host's limit is dropped once it has no
+    requests left, and any failure comes back as the page's `error`. The
+    shared web client refuses hosts that resolve to non-public addresses,
+    including on redirects, and those pages come back `blocked`.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        max_chars: int,
+        min_chars: int,
+        per_host_limit: int,
+        client: httpx.AsyncClient | None = None,
+    ):
+        self.max_bytes = max_bytes
+        self.max_chars = max_chars
+        self.min_chars = min_chars
+        self.per_host_limit = per_host_limit
+        self.http_client = client
+        self._hosts: dict[str, _Host] = {}
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        return self.http_client or clients.web
+
+    @asynccontextmanager
+    async def _host_slot(self, host: str) -> AsyncIterator[None]:
+        entry = self._hosts.get(host)
+        if entry is None:
+            entry = self._hosts[host] = _Host(asyncio.Semaphore(self.per_host_limit))
+        entry.users += 1
+        try:
+            async with entry.slot:
+                yield
+        finally:
+            entry.users -= 1
+            if not entry.users:
+                del self._hosts[host]
+
+    async def fetch(self, url: str) -> FetchedPage:
+        try:
+            parts = urlsplit(url)
+        except ValueError:
+            return FetchedPage(url, error="invalid URL")
+        if parts.scheme not in ("http", "https"):
+            return FetchedPage(url, error="unsupported URL")
+        try:
+            async with self._host_slot(parts.netloc.lower()):
+                page = await self._fetch(url)
+        except BlockedAddress as e:
+            return FetchedPage(url, error=str(e), blocked=True)
+        except Exception as e:
+            # A bad URL or response fails that page only, never the research
+            logger.info("Fetching %s failed: %s", url, e)
+            return FetchedPage(url, error=str(e) or type(e).__name__)
+
+        if page.error is None and len(page.text or "") < self.min_chars:
+            # Pages rendered client-side come back as an almost empty shell
+            page.needs_browser = True
+        return page
+
+    async def _fetch(self, url: str) -> FetchedPage:
+        async with self.client.stream("GET", url) as response:
+            if response.status_code >= 400:
+                return FetchedPage(url, error=f"HTTP {response.status_code}")
+            content_type = response.headers.get("content-type", "").lower()
+            if content_type and not content_type.startswith(TEXT_CONTENT_TYPES):
+                return FetchedPage(
+                    url, error=f"unsupported content type {content_type}"
+                )
+
+            try:
+                decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")(
+                    errors="replace"
+                )
+            except LookupError:
+                decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+            extractor = TextExtractor(self.max_chars)
+            received = 0
+            async for chunk in response.aiter_bytes():
+                chunk = chunk[: self.max_bytes - received]
+                received += len(chunk)
+                extractor.feed(decoder.decode(chunk))
+                if received >= self.max_bytes or extractor.full:
+                    logger.debug("Stopped reading %s after %d bytes", url, received)
+                    break
+            else:
+                extractor.feed(decoder.decode(b"", final=True))
+            extractor.close()
+
+        return FetchedPage(
+            str(response.url), text=extractor.text(), title=extractor.title.strip()
+        )
+
+
+page_fetcher = PageFetcher(
+    max_bytes=Config.FETCH_MAX_BYTES,
+    max_chars=Config.FETCH_MAX_CHARS,
+    min_chars=Config.FETCH_MIN_TEXT_CHARS,
+    per_host_limit=Config.FETCH_PER_HOST_LIMIT,
+)
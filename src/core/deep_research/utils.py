@@ -0,0 +1,30 @@
+import asyncio
+import contextvars
+import functools
+import re
+from concurrent.futures import Executor
+from typing import Any, Callable, TypeVar
+
+T = TypeVar("T")
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a query for use as a cache or deduplication key"""
+    return _WHITESPACE.sub(" ", query).strip().casefold()
+
+
+async def run_in_executor(
+    executor: Executor | None, fn: Callable[..., T], *args: Any
+) -> T:
+    """Run `fn` on `executor` in a copy of the caller's context.
+
+    `loop.run_in_executor` doesn't carry context variables over, so logs
+    written by `fn` would otherwise lose the request's trace id.
+    """
+    context = contextvars.copy_context()
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        executor, functools.partial(context.run, fn, *args)
+    )
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import asyncio
+import ipaddress
+import logging
+import socket
+
+import httpx
+
+logger = logging.getLogger("egress")
+
+
+class BlockedAddress(httpx.RequestError):
+    """Raised for requests to hosts that resolve to a non-public address"""
+
+
+def is_public(address: str) -> bool:
+    """Whether `address` is globally routable unicast, not e.g. loopback or private"""
+    ip = ipaddress.ip_address(address.split("%", 1)[0])
+    if ip.version == 6 and ip.ipv4_mapped is not None:
+        ip = ip.ipv4_mapped
+    return ip.is_global and not ip.is_multicast
+
+
+class PublicAddressTransport(httpx.AsyncBaseTransport):
+    """Refuses requests to hosts that resolve to non-public addresses.
+
+    Pages are fetched from URLs a model picked, so without this a plan could
+    point the server at itself, the private network or a cloud metadata
+    endpoint like 169.254.169.254. The check runs for every request the
+    client sends, so each hop of a redirect is checked before it is fetched.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport):
+        self.transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        port = request.url.port or (443 if request.url.scheme == "https" else 80)
+        try:
+            addresses = await asyncio.get_running_loop().getaddrinfo(
+                host, port, type=socket.SOCK_STREAM
+            )
+        except socket.gaierror as e:
+            raise httpx.ConnectError(str(e), request=request) from e
+
+        for *_, sockaddr in addresses:
+            if not is_public(sockaddr[0]):
+                logger.warning(
+                    "Refusing to fetch %s: %s is not public", host, sockaddr[0]
+                )
+                raise BlockedAddress(
+                    f"{host} resolves to non-public address {sockaddr[0]}",
+                    request=request,
+                )
+        return await self.transport.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
@@ -0,0 +1,101 @@
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
+from .clients import clients
+from .deep_research.routes import deep_research_router
+from .deep_research.scheduler import agent_scheduler
+from .deep_research.cache import search_cache
+from .deep_research.report_cache import report_cache
+from .deep_research.store import result_store
+from .deep_research.admission import admission_controller
+from .deep_research.hedge import search_hedger
+from .deep_research.tools.chart_tool import chart_executor
+from .deep_research.tools.chart_store import render_executor, start_render_workers
+from .deep_research.tools.browser_pool import browser_pool
+from .deep_research.progress import dashboard
+from .deep_research.jobs import job_manager
+from .config import Config
+from .metrics import metrics
+from .log import setup_logging, shutdown_logging
+from contextlib import asynccontextmanager
+from rich.console import Console
+from rich import print as rprint
+
+console = Console()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    setup_logging()
+    console.rule("[bold blue]Deep Research API Starting")
+    rprint("[bold green]🚀 Initializing services...")
+    rprint("[bold yellow]⚙️  Loading configurations...")
+    await clients.start()
+    rprint(
+        f"[bold yellow]🚦 Agent concurrency limits: {agent_scheduler.limits} "
+        f"(default {agent_scheduler.default_limit})"
+    )
+    rprint(f"[bold yellow]🌐 Launching {browser_pool.size} pooled browsers...")
+    await browser_pool.start()
+    rprint(f"[bold yellow]💾 Result store: {result_store.path} ({result_store.codec})")
+    await result_store.start()
+    if Config.CHART_RENDERER == "local":
+        rprint(f"[bold yellow]📊 Starting {Config.CHART_WORKERS} chart render workers...")
+        start_render_workers()
+    await job_manager.start()
+    rprint("[bold green]✨ Initialization completed")
+    if Config.PROGRESS_DASHBOARD:
+        dashboard.start()
+
+    yield
+
+    await job_manager.close()
+    dashboard.stop()
+    console.rule("[bold blue]Deep Research API Stopping")
+    rprint("[bold red]🛑 Shutting down services...")
+    rprint(f"[bold yellow]🚦 Agent scheduler stats: {agent_scheduler.stats()}")
+    rprint(f"[bold yellow]🚧 Admission stats: {admission_controller.stats()}")
+    rprint(f"[bold yellow]🗃️  Search cache stats: {search_cache.stats()}")
+    rprint(f"[bold yellow]📚 Report cache stats: {report_cache.stats()}")
+    rprint(f"[bold yellow]💾 Result store stats: {result_store.stats()}")
+    rprint(f"[bold yellow]⏱️  Search hedging stats: {search_hedger.stats()}")
+    chart_executor.shutdown(wait=False, cancel_futures=True)
+    render_executor.shutdown(wait=False, cancel_futures=True)
+    rprint(f"[bold yellow]🌐 Browser pool stats: {browser_pool.stats()}")
+    await browser_pool.close()
+    await result_store.close()
+    await clients.close()
+    rprint("[bold green]✅ Cleanup completed")
+    shutdown_logging()
+
+
+version = "v1"
+version_prefix = f"/api/{version}"
+
+
+app = FastAPI(
+    title="Deep Research API",
+    version=version,
+    license_info={"name": "MIT License", "url": "https://opensource.org/licenses/MIT"},
+    lifespan=lifespan,
+)
+
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+
+app.include_router(
+    deep_research_router, prefix=f"{version_prefix}", tags=["deep_research"]
+)
+
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics() -> PlainTextResponse:
+    return PlainTextResponse(
+        metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import asyncio
+import email.utils
+import json
+import logging
+import re
+import time
+
+import httpx
+
+from .config import Settings
+from .metrics import metrics
+
+logger = logging.getLogger("rate_limit")
+
+rate_limit_wait_seconds = metrics.histogram(
+    "model_rate_limit_wait_seconds",
+    "Time model calls spent waiting for the rate limiter",
+    ["model"],
+    buckets=(0.01, 0.1, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+rate_limited_responses = metrics.counter(
+    "model_rate_limited_responses",
+    "429 responses received from model providers",
+    ["model"],
+)
+
+retried_requests = metrics.counter(
+    "model_retried_requests",
+    "Model calls retried after a timeout, connection error or transient error status",
+    ["model"],
+)
+
+# Body fields that cap the completion, across the chat and responses APIs
+MAX_TOKEN_FIELDS = ("max_completion_tokens", "max_tokens", "max_output_tokens")
+# Inline images, which are billed per image rather than by their base64 size
+IMAGE_DATA = re.compile(rb"data:image\\?/[\w.+-]+;base64,[A-Za-z0-9+/=\\]+")
+# Error statuses worth retrying, as the OpenAI SDK does
+TRANSIENT_STATUSES = {408, 409, 500, 502, 503, 504}
+DURATION = re.compile(
+    r"(?:(\d+(?:\.\d+)?)h)?(?:(\d+(?:\.\d+)?)m(?!s))?(?:(\d+(?:\.\d+)?)s)?(?:(\d+)ms)?"
+)
+
+
+class TokenBucket:
+    """Allows `per_minute` units a minute, refilled continuously"""
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    def delay(self, amount: float) -> float:
+        """Seconds until `amount` units are available"""
+        self._refill()
+        amount = min(amount, self.capacity)
+        return max(amount - self.tokens, 0) / self.rate
+
+    def take(self, amount: float) -> None:
+        self._refill()
+        self.tokens -= min(amount, self.capacity)
+
+    def limit_to(self, remaining: float) -> None:
+        """Adopt the provider's own count when it is lower than ours"""
+        self._refill()
+        self.tokens = min(self.tokens, remaining)
+
+
+class ModelLimiter:
+    """Request and token buckets for one model, plus a shared backoff deadline.
+
+    Callers are admitted one at a time in arrival order. A 429 moves the
+    backoff deadline forward for every caller of the model, so they all
+    pause together instead of each retrying on its own schedule.
+    """
+
+    def __init__(self, model: str, rpm: int | None, tpm: int | None):
+        self.model = model
+        self.requests = TokenBucket(rpm) if rpm else None
+        self.tokens = TokenBucket(tpm) if tpm else None
+        self.blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens: int) -> None:
+        started = time.monotonic()
+        async with self._lock:
+            while True:
+                delay = self.blocked_until - time.monotonic()
+                if self.requests is not None:
+                    delay = max(delay, self.requests.delay(1))
+                if self.tokens is not None:
+                    delay = max(delay, self.tokens.delay(tokens))
+                if delay <= 0:
+                    break
+                await asyncio.sleep(delay)
+            if self.requests is not None:
+                self.requests.take(1)
+            if self.tokens is not None:
+                self.tokens.take(tokens)
+        waited = time.monotonic() - started
+        if waited > 0.001:
+            rate_limit_wait_seconds.labels(self.model).observe(waited)
+
+    def back_off(self, seconds: float) -> None:
+        until = time.monotonic() + seconds
+        if until > self.blocked_until:
+            logger.warning(
+                "Rate limited by the provider for %s, pausing calls for %.1fs",
+                self.model,
+                seconds,
+            )
+            self.blocked_until = until
+
+    def observe(self, headers: httpx.Headers) -> None:
+        """Sync the buckets with the provider's x-ratelimit-remaining-* headers"""
+        for bucket, header in (
+            (self.requests, "x-ratelimit-remaining-requests"),
+            (self.tokens, "x-ratelimit-remaining-tokens"),
+        ):
+            value = headers.get(header)
+            if bucket is not None and value is not None:
+                try:
+                    bucket.limit_to(float(value))
+                except ValueError:
+                    pass
+
+
+def _parse_duration(value: str) -> float | None:
+    """Parse OpenAI's reset durations such as "1s", "6m0s" or "250ms" """
+    match = DURATION.fullmatch(value.strip())
+    if not match or not any(match.groups()):
+        return None
+    hours, minutes, seconds, millis = (float(g) if g else 0.0 for g in match.groups())
+    return hours * 3600 + minutes * 60 + seconds + millis / 1000
+
+
+def retry_after(headers: httpx.Headers) -> float | None:
+    """Seconds the provider asked us to wait, from whichever header it sent"""
+    value = headers.get("retry-after-ms")
+    if value is not None:
+        try:
+            return float(value) / 1000
+        except ValueError:
+            pass
+
+    value = headers.get("retry-after")
+    if value is not None:
+        try:
+            return float(value)
+        except ValueError:
+            pass
+        try:
+            date = email.utils.parsedate_to_datetime(value)
+            return max(date.timestamp() - time.time(), 0)
+        except (TypeError, ValueError):
+            pass
+
+    resets = [
+        _parse_duration(headers[name])
+        for name in ("x-ratelimit-reset-requests", "x-ratelimit-reset-tokens")
+        if name in headers
+    ]
+    resets = [reset for reset in resets if reset is not None]
+    return max(resets) if resets else None
+
+
+class RateLimitedTransport(httpx.AsyncBaseTransport):
+    """Wraps a model endpoint's transport with per-model rate limiting.
+
+    The prompt size is estimated from the request body before each call and
+    charged to the model's token bucket together with the completion cap.
+    Rate limited responses are retried here after the coordinated backoff.
+    Timeouts, connection errors and transient error statuses are retried too,
+    with the same backoff but only delaying the failed call, since the SDK
+    clients don't retry on top of this.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, settings: Settings):
+        self.transport = transport
+        self.settings = settings
+        self._limiters: dict[str, ModelLimiter] = {}
+
+    def limiter(self, model: str) -> ModelLimiter:
+        if model not in self._limiters:
+            self._limiters[model] = ModelLimiter(
+                model,
+                self.settings.MODEL_RPM_LIMITS.get(model),
+                self.settings.MODEL_TPM_LIMITS.get(model),
+            )
+        return self._limiters[model]
+
+    def _inspect(self, request: httpx.Request) -> tuple[str | None, int]:
+        """Return the requested model and the estimated tokens for the call"""
+        if request.method != "POST" or not request.content:
+            return None, 0
+        try:
+            body = json.loads(request.content)
+        except ValueError:
+            return None, 0
+        if not isinstance(body, dict) or not isinstance(body.get("model"), str):
+            return None, 0
+        completion = next(
+            (body[field] for field in MAX_TOKEN_FIELDS if body.get(field)),
+            self.settings.RATE_LIMIT_COMPLETION_TOKENS,
+        )
+        content, images = IMAGE_DATA.subn(b"", request.content)
+        # About four bytes of JSON per prompt token
+        prompt = len(content) // 4 + images * self.settings.RATE_LIMIT_IMAGE_TOKENS
+        return body["model"], prompt + int(completion)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        model, tokens = self._inspect(request)
+        if model is None:
+            return await self.transport.handle_async_request(request)
+
+        limiter = self.limiter(model)
+        retries = self.settings.RATE_LIMIT_MAX_RETRIES
+        for attempt in range(retries + 1):
+            backoff = self.settings.RATE_LIMIT_BACKOFF_SECONDS * 2**attempt
+            await limiter.acquire(tokens)
+            try:
+                response = await self.transport.handle_async_request(request)
+            except httpx.TransportError as e:
+                if attempt == retries:
+                    raise
+                logger.warning("Retrying %s call after %s", model, type(e).__name__)
+                retried_requests.labels(model).inc()
+                await asyncio.sleep(backoff)
+                continue
+
+            if response.status_code == 429:
+                rate_limited_responses.labels(model).inc()
+                delay = retry_after(response.headers)
+                limiter.back_off(backoff if delay is None else delay)
+            elif response.status_code not in TRANSIENT_STATUSES:
+                limiter.observe(response.headers)
+                return response
+            if attempt == retries:
+                return response
+
+            await response.aclose()
+            if response.status_code != 429:
+                # Unlike a 429 this says nothing about the model's other calls
+                logger.warning(
+                    "Retrying %s call after HTTP %d", model, response.status_code
+                )
+                retried_requests.labels(model).inc()
+                await asyncio.sleep(backoff)
+        return response
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
@@ -11,12 +11,36 @@ const ResearchResponse = z.object({
   follow_up_questions: z.array(z.string()),
 });
 
+const StoredResearch = ResearchResponse.extend({
+  query: z.string(),
+  created_at: z.string(),
+  searches: z.array(z.object({ query: z.string(), summary: z.string() })),
+  charts: z.array(
+    z.object({
+      position: z.string(),
+      title: z.string(),
+      chart_type: z.string(),
+      description: z.string(),
+    }),
+  ),
+});
+
 export const deepResearchRouter = createTRPCRouter({
   getResearch: publicProcedure
     .input(z.object({ prompt: z.string() }))
     .mutation(async ({ input }) => {
       return await deepResearch(input.prompt);
     }),
+  getFollowUpResearch: publicProcedure
+    .input(z.object({ traceId: z.string(), prompt: z.string() }))
+    .mutation(async ({ input }) => {
+      return await followUpResearch(input.traceId, input.prompt);
+    }),
+  getStoredResearch: publicProcedure
+    .input(z.object({ traceId: z.string() }))
+    .query(async ({ input }) => {
+      return await storedResearch(input.traceId);
+    }),
 });
 
 const deepResearch = async (prompt: string) => {
@@ -41,3 +65,28 @@ const deepResearch = async (prompt: string) => {
     throw error;
   }
 };
+
+const followUpResearch = async (traceId: string, prompt: string) => {
+  const { data: research } = await axios.post<
+    z.infer<typeof ResearchResponse>
+  >(
+    `${process.env.CORE_API_URL}/deep_research/${encodeURIComponent(traceId)}/follow_up`,
+    { query: prompt },
+    {
+      headers: {
+        "Content-Type": "application/json",
+      },
+      timeout: REQUEST_TIMEOUT,
+    },
+  );
+
+  return research;
+};
+
+const storedResearch = async (traceId: string) => {
+  const { data: research } = await axios.get<z.infer<typeof StoredResearch>>(
+    `${process.env.CORE_API_URL}/deep_research/${encodeURIComponent(traceId)}`,
+  );
+
+  return research;
+};
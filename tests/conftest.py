@@ -0,0 +1,11 @@
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+# Settings require these, but no test talks to the real services
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("EXTERNAL_API_KEY", "test")
+os.environ.setdefault("EXTERNAL_API_BASE_URL", "http://localhost:9")
+os.environ.setdefault("OPENAI_AGENTS_DISABLE_TRACING", "1")
@@ -0,0 +1,48 @@
+import asyncio
+
+from core.deep_research.agents.planner_agent import WebSearchPlan
+from core.deep_research.batch import ResearchBatch
+
+
+class StubManager:
+    """Plans instantly and holds its slot until the test lets it finish"""
+
+    planned: list[str] = []
+    finish: asyncio.Event
+
+    def __init__(self, batch: ResearchBatch):
+        self.batch = batch
+
+    async def _cached(self, query: str) -> None:
+        return None
+
+    async def _plan_searches(self, query: str) -> WebSearchPlan:
+        StubManager.planned.append(query)
+        return WebSearchPlan(searches=[])
+
+    async def _run_flight(self, query: str) -> dict:
+        await self.batch.plan(query, self)
+        await StubManager.finish.wait()
+        return {"query": query}
+
+
+def test_only_as_many_again_are_planned_ahead() -> None:
+    queries = [f"query {i}" for i in range(10)]
+
+    async def run() -> list[str]:
+        StubManager.planned = []
+        StubManager.finish = asyncio.Event()
+        batch = ResearchBatch(queries, concurrency=2, manager_factory=StubManager)
+        outcomes = batch.run()
+        first = asyncio.create_task(anext(outcomes))
+        await asyncio.sleep(0.01)
+        planned = list(StubManager.planned)
+        StubManager.finish.set()
+        await first
+        rest = [outcome async for outcome in outcomes]
+        assert len(rest) == len(queries) - 1
+        return planned
+
+    planned = asyncio.run(run())
+    assert planned == queries[:4]
+    assert sorted(StubManager.planned) == sorted(queries)
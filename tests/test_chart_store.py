@@ -0,0 +1,36 @@
+import os
+from pathlib import Path
+
+from core.deep_research.tools.chart_store import ChartStore
+
+
+def store(directory: Path, max_bytes: int) -> ChartStore:
+    charts = ChartStore(str(directory), max_bytes=max_bytes)
+    charts._render = lambda chart_config, fmt: b"x" * 100
+    return charts
+
+
+def test_least_recently_used_charts_are_evicted(tmp_path: Path) -> None:
+    charts = store(tmp_path, max_bytes=290)
+    first = charts.put({"n": 1})
+    second = charts.put({"n": 2})
+    os.utime(tmp_path / first, (1, 1))
+    os.utime(tmp_path / second, (2, 2))
+
+    # Reusing the first chart makes the second the least recently used
+    assert charts.put({"n": 1}) == first
+    third = charts.put({"n": 3})
+
+    assert charts.path(first) is not None
+    assert charts.path(second) is None
+    assert charts.path(third) is not None
+
+
+def test_existing_charts_count_towards_the_limit(tmp_path: Path) -> None:
+    old = store(tmp_path, max_bytes=1000).put({"n": 1})
+    os.utime(tmp_path / old, (1, 1))
+
+    charts = store(tmp_path, max_bytes=150)
+    charts.put({"n": 2})
+
+    assert charts.path(old) is None
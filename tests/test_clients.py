@@ -0,0 +1,27 @@
+import asyncio
+
+from core.clients import ClientRegistry
+from core.config import Config
+from core.deep_research.agents.writer_agent import writer_agent
+
+
+def test_each_lifespan_gets_open_clients() -> None:
+    registry = ClientRegistry(Config)
+    model = registry.external_model("o3-mini")
+
+    async def lifespan() -> tuple:
+        await registry.start()
+        opened = (registry.external, registry.web, model._resolve()._client)
+        await registry.close()
+        return opened
+
+    first = asyncio.run(lifespan())
+    second = asyncio.run(lifespan())
+    assert first[0].is_closed() and first[1].is_closed
+    assert second[0] is not first[0] and second[1] is not first[1]
+    # The model follows the registry to the client of the current lifespan
+    assert first[2] is first[0] and second[2] is second[0]
+
+
+def test_writer_does_not_bind_a_client_at_import() -> None:
+    assert writer_agent.model._bound is None
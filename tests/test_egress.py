@@ -0,0 +1,67 @@
+import asyncio
+
+import httpx
+import pytest
+
+from core.deep_research.tools.fetch import PageFetcher
+from core.egress import PublicAddressTransport, is_public
+
+PUBLIC = "http://93.184.216.34"
+
+
+@pytest.mark.parametrize(
+    "address",
+    [
+        "127.0.0.1",
+        "10.0.0.5",
+        "192.168.1.1",
+        "169.254.169.254",
+        "100.64.0.1",
+        "0.0.0.0",
+        "224.0.0.1",
+        "::1",
+        "fe80::1%eth0",
+        "::ffff:127.0.0.1",
+    ],
+)
+def test_non_public_addresses(address: str) -> None:
+    assert not is_public(address)
+
+
+def test_public_addresses() -> None:
+    assert is_public("93.184.216.34")
+    assert is_public("2606:4700::1")
+
+
+def site(request: httpx.Request) -> httpx.Response:
+    if request.url.path == "/redirect":
+        return httpx.Response(302, headers={"Location": "http://127.0.0.1:8000/"})
+    body = "<html><body><p>" + "public text " * 100 + "</p></body></html>"
+    return httpx.Response(200, html=body)
+
+
+def fetch(url: str):
+    async def run():
+        client = httpx.AsyncClient(
+            transport=PublicAddressTransport(httpx.MockTransport(site)),
+            follow_redirects=True,
+        )
+        async with client:
+            fetcher = PageFetcher(10_000, 5_000, 100, 2, client=client)
+            return await fetcher.fetch(url)
+
+    return asyncio.run(run())
+
+
+def test_public_pages_are_fetched() -> None:
+    page = fetch(f"{PUBLIC}/page")
+    assert page.error is None and "public text" in page.text
+
+
+@pytest.mark.parametrize(
+    "url", ["http://169.254.169.254/latest/meta-data/", f"{PUBLIC}/redirect"]
+)
+def test_non_public_pages_are_blocked(url: str) -> None:
+    page = fetch(url)
+    assert page.blocked and page.text is None
+    assert "non-public address" in page.error
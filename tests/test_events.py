@@ -0,0 +1,30 @@
+import asyncio
+
+from core.deep_research.events import EventLog
+
+
+def replay(log: EventLog, after_id: int) -> list:
+    async def collect() -> list:
+        return [item async for item in log.subscribe(after_id)]
+
+    return asyncio.run(collect())
+
+
+def test_resuming_past_dropped_events_reports_the_gap():
+    log = EventLog(max_events=3)
+    for n in range(6):
+        log.append({"n": n})
+    log.close()
+
+    (gap_id, gap), *rest = replay(log, 1)
+    assert (gap_id, gap["type"], gap["count"]) == (3, "events_dropped", 2)
+    assert rest == [(4, {"n": 3}), (5, {"n": 4}), (6, {"n": 5})]
+
+
+def test_resuming_within_the_log_has_no_gap():
+    log = EventLog(max_events=3)
+    for n in range(6):
+        log.append({"n": n})
+    log.close()
+
+    assert replay(log, 4) == [(5, {"n": 4}), (6, {"n": 5})]
@@ -0,0 +1,46 @@
+import pytest
+
+from core.config import Config
+from core.deep_research.agents.planner_agent import WebSearchItem, WebSearchPlan
+from core.deep_research.manager import DeepResearchManager
+
+
+def item(query: str) -> WebSearchItem:
+    return WebSearchItem(reason="", query=query, url="")
+
+
+@pytest.mark.parametrize(
+    "answered, planned",
+    [
+        (
+            "global electric vehicle sales figures 2023",
+            "global electric vehicle sales figures 2025",
+        ),
+        (
+            "electric vehicle price trends in China",
+            "electric vehicle price trends in India",
+        ),
+        ("US solar installation growth", "US wind installation growth"),
+    ],
+)
+def test_new_searches_are_kept(answered: str, planned: str) -> None:
+    plan = WebSearchPlan(searches=[item(planned)])
+    kept = DeepResearchManager()._unanswered_searches(plan, [item(answered)])
+    assert [search.query for search in kept.searches] == [planned]
+
+
+def test_answered_searches_are_skipped() -> None:
+    plan = WebSearchPlan(
+        searches=[item("EV battery prices"), item("EV charging in Europe")]
+    )
+    kept = DeepResearchManager()._unanswered_searches(plan, [item("ev battery price")])
+    assert [search.query for search in kept.searches] == ["EV charging in Europe"]
+
+
+def test_threshold_limits_how_much_generic_wording_may_differ(monkeypatch) -> None:
+    plan = WebSearchPlan(searches=[item("latest EV battery prices overview")])
+    answered = [item("EV battery prices")]
+    for threshold, kept_queries in ((0.6, []), (0.8, [plan.searches[0].query])):
+        monkeypatch.setattr(Config, "FOLLOW_UP_SEARCH_THRESHOLD", threshold)
+        kept = DeepResearchManager()._unanswered_searches(plan, answered)
+        assert [search.query for search in kept.searches] == kept_queries
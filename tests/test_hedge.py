@@ -0,0 +1,103 @@
+import asyncio
+from typing import Awaitable, Callable
+
+import pytest
+from agents import Agent
+
+from core.deep_research.hedge import Hedger
+from core.deep_research.scheduler import AgentScheduler
+
+agent = Agent(name="Search agent", model="test-model")
+
+
+def primed_hedger() -> Hedger:
+    hedger = Hedger(percentile=0.5, min_samples=3)
+
+    async def fast() -> str:
+        return "fast"
+
+    async def prime() -> None:
+        for _ in range(3):
+            await hedger.run(fast)
+
+    asyncio.run(prime())
+    return hedger
+
+
+def slow_then_fast() -> Callable[[], Awaitable[str]]:
+    calls = 0
+
+    async def call() -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(1 if calls == 1 else 0)
+        return f"attempt {calls}"
+
+    return call
+
+
+def test_hedged_call_records_the_primarys_elapsed_time():
+    hedger = primed_hedger()
+    delay = hedger.hedge_delay()
+
+    result = asyncio.run(hedger.run(slow_then_fast()))
+
+    assert result == "attempt 2"
+    assert hedger.stats()["hedge_wins"] == 1
+    # The cancelled primary had been running for at least the hedge delay
+    assert hedger._samples[-1] >= delay
+
+
+def test_cancelled_call_is_recorded_as_at_least_its_elapsed_time():
+    hedger = Hedger(percentile=0.9, min_samples=100)
+
+    async def slow() -> None:
+        await asyncio.sleep(1)
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(asyncio.wait_for(hedger.run(slow), 0.05))
+
+    assert len(hedger._samples) == 1
+    assert hedger._samples[0] >= 0.05
+
+
+def run_hedged(scheduler: AgentScheduler, hedger: Hedger) -> tuple[str, int]:
+    peak = 0
+
+    async def search() -> str:
+        nonlocal peak
+        peak = max(peak, scheduler.stats()["test-model"]["in_flight"])
+        return await call()
+
+    call = slow_then_fast()
+
+    async def main() -> str:
+        async with scheduler.slot(agent):
+            return await hedger.run(
+                search, reserve=lambda: scheduler.try_acquire(agent)
+            )
+
+    return asyncio.run(main()), peak
+
+
+def test_hedge_takes_a_slot_of_its_own():
+    scheduler = AgentScheduler({"test-model": 2}, 2, "test-model")
+    hedger = primed_hedger()
+
+    result, peak = run_hedged(scheduler, hedger)
+
+    assert result == "attempt 2"
+    assert peak == 2
+    assert scheduler.stats()["test-model"]["in_flight"] == 0
+
+
+def test_hedge_is_skipped_without_a_free_slot():
+    scheduler = AgentScheduler({"test-model": 1}, 1, "test-model")
+    hedger = primed_hedger()
+
+    result, peak = run_hedged(scheduler, hedger)
+
+    assert result == "attempt 1"
+    assert peak == 1
+    assert hedger.stats()["hedges_skipped"] == 1
+    assert scheduler.stats()["test-model"]["in_flight"] == 0
@@ -0,0 +1,76 @@
+import asyncio
+
+from core.deep_research.admission import AdmissionController
+from core.deep_research.jobs import JobManager
+
+
+class StubManager:
+    def __init__(self, admission: AdmissionController, seen: list[int]):
+        self.admission = admission
+        self.seen = seen
+
+    async def run_events(self, query: str):
+        self.seen.append(self.admission.in_flight)
+        yield {"type": "start", "trace_id": query}
+        yield {"type": "complete"}
+
+
+def controller(max_in_flight: int) -> AdmissionController:
+    return AdmissionController(
+        max_in_flight=max_in_flight,
+        max_queue_wait=30,
+        degrade_at=0.5,
+        max_searches=20,
+        min_searches=5,
+        retry_after=5,
+        poll_seconds=0.01,
+    )
+
+
+def jobs(admission: AdmissionController, seen: list[int]) -> JobManager:
+    return JobManager(
+        workers=2,
+        max_pending=10,
+        max_events=100,
+        retention_seconds=60,
+        manager_factory=lambda: StubManager(admission, seen),
+        admission=admission,
+    )
+
+
+def test_running_jobs_are_admitted() -> None:
+    admission = controller(max_in_flight=4)
+    seen: list[int] = []
+
+    async def run() -> None:
+        manager = jobs(admission, seen)
+        await manager.start()
+        job = manager.submit("query")
+        await manager._queue.join()
+        await manager.close()
+        assert job.status == "completed"
+
+    asyncio.run(run())
+    assert seen == [1]
+    assert admission.in_flight == 0
+
+
+def test_jobs_wait_for_capacity() -> None:
+    admission = controller(max_in_flight=1)
+    seen: list[int] = []
+
+    async def run() -> None:
+        manager = jobs(admission, seen)
+        await manager.start()
+        held = admission.admit()
+        job = manager.submit("query")
+        await asyncio.sleep(0.05)
+        assert job.status == "queued"
+        held.release()
+        await manager._queue.join()
+        await manager.close()
+        assert job.status == "completed"
+
+    asyncio.run(run())
+    assert seen == [1]
+    assert admission.rejected == 0
@@ -0,0 +1,47 @@
+import asyncio
+
+import httpx
+import pytest
+
+from core.config import Config
+from core.ratelimit import RateLimitedTransport
+
+
+def post(*outcomes: int | Exception) -> httpx.Response:
+    """Make one model call against a provider answering with `outcomes` in turn"""
+    replies = iter(outcomes)
+
+    def provider(request: httpx.Request) -> httpx.Response:
+        reply = next(replies)
+        if isinstance(reply, Exception):
+            raise reply
+        return httpx.Response(reply, json={})
+
+    async def call() -> httpx.Response:
+        transport = RateLimitedTransport(httpx.MockTransport(provider), Config)
+        async with httpx.AsyncClient(transport=transport) as client:
+            return await client.post(
+                "http://provider/v1/responses", json={"model": "m"}
+            )
+
+    return asyncio.run(call())
+
+
+@pytest.fixture(autouse=True)
+def fast_backoff(monkeypatch):
+    monkeypatch.setattr(Config, "RATE_LIMIT_BACKOFF_SECONDS", 0.001)
+
+
+def test_transient_failures_are_retried():
+    assert post(httpx.ConnectError("reset"), 503, 429, 200).status_code == 200
+
+
+def test_client_errors_are_not_retried():
+    assert post(400, 200).status_code == 400
+
+
+def test_the_last_failure_is_returned_once_retries_run_out():
+    retries = Config.RATE_LIMIT_MAX_RETRIES
+    assert post(*[502] * (retries + 1), 200).status_code == 502
+    with pytest.raises(httpx.ReadTimeout):
+        post(*[httpx.ReadTimeout("slow")] * (retries + 1))
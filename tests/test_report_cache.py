@@ -0,0 +1,52 @@
+import pytest
+
+from core.deep_research.report_cache import ReportCache
+
+DIFFERENT_QUESTIONS = [
+    (
+        "climate change impact on agriculture and food security in India",
+        "climate change impact on agriculture and food security in China",
+    ),
+    (
+        "market share of EV manufacturers in Germany in 2024",
+        "market share of EV manufacturers in France in 2024",
+    ),
+    (
+        "advantages of renewable energy adoption for small businesses",
+        "disadvantages of renewable energy adoption for small businesses",
+    ),
+    ("EV market 2025 trends", "EV market 2024 trends"),
+]
+
+SAME_QUESTIONS = [
+    ("EV market 2025 trends", "trends in the 2025 EV market"),
+    ("best python web frameworks", "best python web framework"),
+    ("impact of AI on jobs", "how will AI impact jobs"),
+    ("EV market 2025 trends", "latest EV market 2025 trends"),
+]
+
+
+def cache(threshold: float = 0.85) -> ReportCache:
+    return ReportCache(threshold=threshold, ttl_seconds=60, max_bytes=1 << 24)
+
+
+@pytest.mark.parametrize("cached, asked", DIFFERENT_QUESTIONS)
+def test_different_questions_miss(cached: str, asked: str) -> None:
+    reports = cache()
+    reports.set(cached, {"trace_id": "t", "report": cached})
+    assert reports.get(asked) is None
+
+
+@pytest.mark.parametrize("cached, asked", SAME_QUESTIONS)
+def test_rephrased_questions_hit(cached: str, asked: str) -> None:
+    reports = cache()
+    reports.set(cached, {"trace_id": "t", "report": cached})
+    assert reports.get(asked) == {"trace_id": "t", "report": cached}
+
+
+def test_threshold_limits_how_much_generic_wording_may_differ() -> None:
+    cached, asked = "EV market 2025 trends", "latest EV market 2025 trends overview"
+    for threshold, hit in ((0.7, True), (0.85, False)):
+        reports = cache(threshold)
+        reports.set(cached, {"trace_id": "t", "report": cached})
+        assert (reports.get(asked) is not None) is hit
@@ -0,0 +1,14 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from core.deep_research.utils import run_in_executor
+from core.log import trace_id_var
+
+
+def test_executor_work_keeps_the_trace_id():
+    async def main() -> str | None:
+        trace_id_var.set("trace_123")
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return await run_in_executor(executor, trace_id_var.get)
+
+    assert asyncio.run(main()) == "trace_123"